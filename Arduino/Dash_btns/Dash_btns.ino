@@ -17,6 +17,21 @@ const int BUTTON2_PIN = 3;
 int lastButton1State = HIGH;
 int lastButton2State = HIGH;
 
+// Timing
+const unsigned long POLL_MS = 5;        // how often the pins are read
+const unsigned long HEARTBEAT_MS = 200; // state is resent this often even without a change
+unsigned long lastSend = 0;
+
+// Sends "b1,b2,millis" - PyDashMain times presses from the millis stamp, not from when the line arrives
+void sendState(int b1, int b2) {
+  lastSend = millis();
+  Serial.print(b1);
+  Serial.print(",");
+  Serial.print(b2);
+  Serial.print(",");
+  Serial.println(lastSend);
+}
+
 void setup() {
   Serial.begin(115200);
   pinMode(BUTTON1_PIN, INPUT_PULLUP);
@@ -36,9 +51,12 @@ void loop() {
   int b1 = digitalRead(BUTTON1_PIN);
   int b2 = digitalRead(BUTTON2_PIN);
 
-  Serial.print(b1);
-  Serial.print(",");
-  Serial.println(b2);
+  // changes go out right away, otherwise a heartbeat so the Pi can resync
+  if (b1 != lastButton1State || b2 != lastButton2State || millis() - lastSend >= HEARTBEAT_MS) {
+    sendState(b1, b2);
+    lastButton1State = b1;
+    lastButton2State = b2;
+  }
 
-  delay(200);
+  delay(POLL_MS);
 }
\ No newline at end of file
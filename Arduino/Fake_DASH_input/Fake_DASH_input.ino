@@ -7,6 +7,8 @@
 
 
 // Configurations
+// 0 = key:value CSV lines, 1 = compact binary IMU packets (lean, accel, brake only - what PyDashMain reads)
+#define BINARY_PROTOCOL 0
 unsigned long updateInterval = 50;   // ms between updates (20 Hz output)
 float sweepSpeed = 0.02;            // speed of oscillation for most sensors
 
@@ -19,10 +21,72 @@ unsigned long lastGearChange = 0;
 unsigned long gearInterval = 1500;  // ms between automatic gear changes
 
 
+// ---- Binary packet helpers (BINARY_PROTOCOL 1) ----
+// Packet: sync 0xA5 | type 0x01 | seq | lean, ax, ay, brake (float, little endian) | CRC-16/CCITT (init 0xFFFF)
+// COBS encoded and ended with a 0x00 byte, decoded in PyDashMain read_serial / parse_imu_packet
+uint8_t packetSeq = 0;
+
+uint16_t crc16(const uint8_t *data, size_t len) {
+  uint16_t crc = 0xFFFF;
+  while (len--) {
+    crc ^= (uint16_t)(*data++) << 8;
+    for (int i = 0; i < 8; i++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+// COBS encode len bytes of in into out (out needs len + 2 bytes), returns encoded length
+size_t cobsEncode(const uint8_t *in, size_t len, uint8_t *out) {
+  size_t readIdx = 0;
+  size_t writeIdx = 1;
+  size_t codeIdx = 0;
+  uint8_t code = 1;
+  while (readIdx < len) {
+    if (in[readIdx] == 0) {
+      out[codeIdx] = code;
+      code = 1;
+      codeIdx = writeIdx++;
+      readIdx++;
+    } else {
+      out[writeIdx++] = in[readIdx++];
+      code++;
+      if (code == 0xFF) {
+        out[codeIdx] = code;
+        code = 1;
+        codeIdx = writeIdx++;
+      }
+    }
+  }
+  out[codeIdx] = code;
+  return writeIdx;
+}
+
+void sendPacket(float lean, float ax, float ay, float brake) {
+  uint8_t raw[21];
+  uint8_t framed[23];
+  raw[0] = 0xA5;
+  raw[1] = 0x01;
+  raw[2] = packetSeq++;
+  memcpy(raw + 3, &lean, 4);   // AVR floats are already 32 bit little endian
+  memcpy(raw + 7, &ax, 4);
+  memcpy(raw + 11, &ay, 4);
+  memcpy(raw + 15, &brake, 4);
+  uint16_t crc = crc16(raw, 19);
+  raw[19] = crc & 0xFF;
+  raw[20] = crc >> 8;
+  size_t n = cobsEncode(raw, sizeof(raw), framed);
+  Serial.write(framed, n);
+  Serial.write((uint8_t)0);
+}
+
 void setup() {
   delay(5000);                      // startup delay for your UI system
   Serial.begin(115200);
+#if !BINARY_PROTOCOL
   Serial.println("Starting fake motorcycle data generator...");
+#endif
 }
 
 
@@ -72,7 +136,9 @@ void loop() {
     float accelLat = cos(t * 2.2);
 
     // Serial Output
-
+#if BINARY_PROTOCOL
+    sendPacket(lean, accelLong, accelLat, brake);
+#else
     Serial.print("RPM:");           Serial.print(rpm);
     Serial.print(",SPD:");          Serial.print(speed);
     Serial.print(",GEAR:");         Serial.print(gear);
@@ -85,5 +151,6 @@ void loop() {
     Serial.print(",AX:");           Serial.print(accelLong, 2);
     Serial.print(",AY:");           Serial.print(accelLat, 2);
     Serial.println();
+#endif
   }
 }
@@ -1,5 +1,8 @@
 #include <Wire.h>
 
+// 0 = key:value CSV lines (works with every PyDashMain version), 1 = compact binary packets
+#define BINARY_PROTOCOL 0
+
 // Offsets (replace these with new calibration) (last calib 12/10/25 - off bike)
 // offsets deal with acceleration and gyrometric forces from earch rotation and orbit. 
 int16_t ax_offset = 2040;
@@ -13,6 +16,66 @@ float angle = 0.0;
 float corrAngle = 0.0;
 unsigned long lastTime;
 
+// ---- Binary packet helpers (BINARY_PROTOCOL 1) ----
+// Packet: sync 0xA5 | type 0x01 | seq | lean, ax, ay, brake (float, little endian) | CRC-16/CCITT (init 0xFFFF)
+// COBS encoded and ended with a 0x00 byte, decoded in PyDashMain read_serial / parse_imu_packet
+uint8_t packetSeq = 0;
+
+uint16_t crc16(const uint8_t *data, size_t len) {
+  uint16_t crc = 0xFFFF;
+  while (len--) {
+    crc ^= (uint16_t)(*data++) << 8;
+    for (int i = 0; i < 8; i++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+// COBS encode len bytes of in into out (out needs len + 2 bytes), returns encoded length
+size_t cobsEncode(const uint8_t *in, size_t len, uint8_t *out) {
+  size_t readIdx = 0;
+  size_t writeIdx = 1;
+  size_t codeIdx = 0;
+  uint8_t code = 1;
+  while (readIdx < len) {
+    if (in[readIdx] == 0) {
+      out[codeIdx] = code;
+      code = 1;
+      codeIdx = writeIdx++;
+      readIdx++;
+    } else {
+      out[writeIdx++] = in[readIdx++];
+      code++;
+      if (code == 0xFF) {
+        out[codeIdx] = code;
+        code = 1;
+        codeIdx = writeIdx++;
+      }
+    }
+  }
+  out[codeIdx] = code;
+  return writeIdx;
+}
+
+void sendPacket(float lean, float ax, float ay, float brake) {
+  uint8_t raw[21];
+  uint8_t framed[23];
+  raw[0] = 0xA5;
+  raw[1] = 0x01;
+  raw[2] = packetSeq++;
+  memcpy(raw + 3, &lean, 4);   // AVR floats are already 32 bit little endian
+  memcpy(raw + 7, &ax, 4);
+  memcpy(raw + 11, &ay, 4);
+  memcpy(raw + 15, &brake, 4);
+  uint16_t crc = crc16(raw, 19);
+  raw[19] = crc & 0xFF;
+  raw[20] = crc >> 8;
+  size_t n = cobsEncode(raw, sizeof(raw), framed);
+  Serial.write(framed, n);
+  Serial.write((uint8_t)0);
+}
+
 void setup() {
   Serial.begin(115200);
   Wire.begin();
@@ -76,6 +139,9 @@ void loop() {
   corrAngle = angle + 7.75;
   //Serial.println("lean:" + corrAngle + "," + "AX:" + ax + "AY:" + ay);
   //Serial.println(corrAngle);
+#if BINARY_PROTOCOL
+  sendPacket(corrAngle, ax_g, ay_g, 0.0); //brake pressure still to come
+#else
   Serial.print("LEAN:"); 
   Serial.print(corrAngle);
   Serial.print(",AX:");
@@ -84,6 +150,7 @@ void loop() {
   Serial.print(ay_g);
   Serial.print(",BRK:");
   Serial.println("0 "); //change off ln for future use
+#endif
 
   //There was a 5 degree drift from 20 to 25 degrees on both sides, not sure where it went but whatever,
   //Brake pressure code still needs to be added.
@@ -0,0 +1,204 @@
+#Offline CAN signal discovery for setting up main code
+
+"""
+CAN Signal Analyzer
+--------------------------------
+Finds which CAN ID / bytes carry RPM, speed, gear... from a capture made with
+    python3 CanSniff.py --capture ride.pdcl
+
+Every ID is split into every candidate field (each byte as u8/s8, each byte pair as
+u16/s16 big and little endian). Each candidate is sampled at the reference trace's timestamps and
+ranked by correlation with it. The reference is a CSV of time,value - a throttle sweep written down
+by hand, the IMU log, a GPS speed trace... (time in the same epoch seconds as the capture,
+use --ref-offset to line the clocks up).
+The best match is printed as CAN_ID_* / CAN_SIGNALS lines for PyDashMain, scale and offset fitted
+so raw * scale + offset lands on the reference units.
+
+    python3 CanAnalyze.py ride.pdcl --ref throttle.csv --name tps
+    python3 CanAnalyze.py ride.pdcl                  (no reference: list the most active fields)
+
+Everything is vectorized with NumPy - a 30 minute capture at thousands of frames/s takes seconds.
+"""
+
+import argparse
+
+import numpy as np
+
+import CanLog
+
+#same layout as CanLog.RECORD
+RECORD_DTYPE = np.dtype({
+    "names": ["t", "id", "dlc", "flags", "data"],
+    "formats": ["<f8", "<u4", "u1", "u1", ("u1", 8)],
+    "offsets": [0, 8, 12, 13, 16],
+    "itemsize": CanLog.RECORD.size,
+})
+
+
+def load_capture(path):
+    """
+    Returns the capture's data frames oldest first as a structured array.
+    Error and remote frames are dropped.
+    """
+    capacity, count = CanLog.read_header(path)
+    records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=CanLog.HEADER.size, shape=(capacity,))
+    if count > capacity:
+        first = count % capacity
+        records = np.concatenate((records[first:], records[:first]))
+    else:
+        records = records[:count]
+    keep = (records["flags"] & (CanLog.FLAG_ERROR | CanLog.FLAG_REMOTE)) == 0
+    return records[keep]
+
+
+def load_reference(path, column=None, offset=0.0):
+    #CSV with a header row, time in the first column
+    ref = np.genfromtxt(path, delimiter=",", names=True)
+    names = ref.dtype.names
+    values = ref[column] if column else ref[names[1]]
+    times = ref[names[0]] + offset
+    ok = np.isfinite(times) & np.isfinite(values)
+    order = np.argsort(times[ok], kind="stable")
+    return times[ok][order], values[ok][order]
+
+
+def candidate_fields(data, dlc):
+    """
+    data is (n, 8) uint8. Returns (labels, matrix) where matrix is (n, k) float64, one column per
+    candidate field that fits inside dlc.
+    Labels are (start_byte, length, byte_order, signed).
+    """
+    d = data.astype(np.int64)
+    be = (d[:, :-1] << 8) | d[:, 1:]
+    le = d[:, :-1] | (d[:, 1:] << 8)
+    columns = [d, d - ((d & 0x80) << 1), be, be - ((be & 0x8000) << 1), le, le - ((le & 0x8000) << 1)]
+    kinds = [(1, "big", False), (1, "big", True), (2, "big", False), (2, "big", True),
+             (2, "little", False), (2, "little", True)]
+
+    labels = []
+    mats = []
+    for (length, order, signed), col in zip(kinds, columns):
+        n_fit = max(0, dlc - length + 1)
+        for start in range(n_fit):
+            labels.append((start, length, order, signed))
+        mats.append(col[:, :n_fit])
+    return labels, np.hstack(mats).astype(np.float64)
+
+
+def correlate(matrix, ref):
+    #Pearson r of every column against ref, constant columns get 0
+    m = matrix - matrix.mean(axis=0)
+    r = ref - ref.mean()
+    denom = np.sqrt((m * m).sum(axis=0) * (r * r).sum())
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = (m.T @ r) / denom
+    return np.nan_to_num(corr)
+
+
+def analyze(records, ref_t=None, ref_v=None):
+    """
+    Returns a list of result dicts, best first.
+    With a reference: each candidate is sampled (zero order hold) at the reference timestamps and
+    ranked by |r|, with scale/offset fitted by least squares.
+    Without one: ranked by how often the field changes.
+    """
+    order = np.argsort(records["id"], kind="stable") #stable keeps each ID in time order
+    ids = records["id"][order]
+    split = np.flatnonzero(np.diff(ids)) + 1
+    results = []
+
+    for idx in np.split(order, split):
+        if len(idx) < 2:
+            continue
+        can_id = int(records["id"][idx[0]])
+        times = records["t"][idx]
+        dlc = int(np.bincount(records["dlc"][idx]).argmax())
+        if dlc == 0:
+            continue
+
+        if ref_t is None:
+            #order/signedness can't be told apart without a reference, so just bytes and byte pairs
+            changed = np.diff(records["data"][idx][:, :dlc], axis=0) != 0
+            scores = [((i, 1, "big", False), changed[:, i].sum()) for i in range(dlc)]
+            scores += [((i, 2, "big", False), (changed[:, i] | changed[:, i + 1]).sum()) for i in range(dlc - 1)]
+            for label, score in scores:
+                if score:
+                    results.append({"id": can_id, "field": label, "score": int(score), "frames": len(idx)})
+            continue
+
+        #only the reference samples inside this ID's time span
+        inside = (ref_t >= times[0]) & (ref_t <= times[-1])
+        if inside.sum() < 3:
+            continue
+        at = np.searchsorted(times, ref_t[inside], side="right") - 1
+        labels, mat = candidate_fields(records["data"][idx[at]], dlc)
+        ref = ref_v[inside]
+        corr = correlate(mat, ref)
+
+        var = mat.var(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scale = ((mat - mat.mean(axis=0)) * (ref - ref.mean())[:, None]).mean(axis=0) / var
+        offset = ref.mean() - scale * mat.mean(axis=0)
+        for i, label in enumerate(labels):
+            if var[i] > 0:
+                results.append({"id": can_id, "field": label, "score": float(abs(corr[i])), "r": float(corr[i]),
+                                "scale": float(scale[i]), "offset": float(offset[i]), "frames": len(idx)})
+
+    results.sort(key=lambda res: res["score"], reverse=True)
+    return results
+
+
+def describe(field):
+    start, length, order, signed = field
+    kind = ("s" if signed else "u") + str(length * 8)
+    if length == 1:
+        return f"byte {start} {kind}"
+    return f"bytes {start}-{start + length - 1} {kind} {order}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank CAN fields against a reference trace")
+    parser.add_argument("capture", help="binary capture from CanSniff.py --capture")
+    parser.add_argument("--ref", help="reference CSV (time,value with header)")
+    parser.add_argument("--column", help="reference column to use (default: second column)")
+    parser.add_argument("--ref-offset", type=float, default=0.0, help="seconds added to the reference times")
+    parser.add_argument("--name", default="signal", help="PyDashMain variable name for the suggestion")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    records = load_capture(args.capture)
+    print(f"{len(records)} frames, {len(np.unique(records['id']))} IDs, "
+          f"{records['t'][-1] - records['t'][0]:.1f} s" if len(records) else "Empty capture")
+    if not len(records):
+        return
+
+    if args.ref:
+        ref_t, ref_v = load_reference(args.ref, args.column, args.ref_offset)
+        results = analyze(records, ref_t, ref_v)
+    else:
+        results = analyze(records)
+
+    if not results:
+        print("No candidates - check the reference overlaps the capture in time (--ref-offset)")
+        return
+
+    for rank, res in enumerate(results[:args.top], 1):
+        line = f"{rank:3}. 0x{res['id']:03X}  {describe(res['field']):<22}"
+        if args.ref:
+            line += f" r={res['r']:+.3f}  scale={res['scale']:.6g}  offset={res['offset']:.6g}"
+        else:
+            line += f" {res['score']} changes"
+        print(line)
+
+    if args.ref:
+        best = results[0]
+        start, length, order, signed = best["field"]
+        const = f"CAN_ID_{args.name.upper()}"
+        print("\nPaste into PyDashMain.py:")
+        print(f"{const} = 0x{best['id']:03X}")
+        print(f'CanSignal("{args.name}", {const}, {start}, {length}, "{order}", {signed}, '
+              f"{best['scale']:.6g}, {best['offset']:.6g}),")
+
+
+if __name__ == "__main__":
+    main()
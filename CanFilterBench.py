@@ -0,0 +1,137 @@
+#CAN filter benchmark - measures what the kernel CAN filters save the dash
+
+"""
+CAN Filter Benchmark
+--------------------------------
+Floods a CAN interface with traffic at a realistic rate (a mix of the IDs PyDashMain decodes and
+other ECU chatter) and runs the dash's CanReader against it twice:
+- unfiltered (CAN_SNIFF_ALL = True)
+- with the kernel filters built from CAN_SIGNALS
+
+For each run it reports the CPU time used by the reader and the voluntary context switches (wakeups).
+
+Run it against a virtual CAN interface so no bike is needed:
+    sudo ip link add dev vcan0 type vcan
+    sudo ip link set up vcan0
+    python3 CanFilterBench.py --channel vcan0 --rate 2000 --seconds 10
+
+Without vcan (no kernel module, no root) --replay plays the same generated traffic through CanLog.ReplayBus
+at real speed instead. The filtered run gets a log with only the frames the kernel filters would let through.
+That covers the reader's side only; the kernel's own per-frame cost isn't in it.
+    python3 CanFilterBench.py --replay --rate 2000 --seconds 10
+
+Results so far (--replay, one x86 core, 2000 frames/s over 40 IDs for 10 s, 6 of them decoded, two runs):
+    unfiltered: 0.92-1.06 s CPU (9-11% of a core)  ~38k voluntary context switches  20000 frames
+    filtered:   0.25-0.30 s CPU (2.5-3% of a core)  ~6k voluntary context switches   ~3000 frames
+    = about 72% less CPU and 85% fewer wakeups for the reader
+The socketcan/vcan run and the Pi have NOT been measured yet.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import time
+
+import can
+
+import CanLog
+import PyDashMain
+
+
+def send_traffic(channel, rate, seconds, n_ids):
+    #Runs in its own process so the sender's CPU isn't counted against the reader
+    bus = can.interface.Bus(channel=channel, interface='socketcan')
+    ours = sorted(PyDashMain.CAN_DECODERS)
+    others = [i for i in range(0x080, 0x7FF) if i not in PyDashMain.CAN_DECODERS]
+    ids = ours + random.sample(others, max(0, n_ids - len(ours)))
+    batch = max(1, rate // 100) #send every 10ms
+    end = time.monotonic() + seconds
+    next_send = time.monotonic()
+    while time.monotonic() < end:
+        for _ in range(batch):
+            data = bytes(random.getrandbits(8) for _ in range(8))
+            try:
+                bus.send(can.Message(arbitration_id=random.choice(ids), data=data, is_extended_id=False))
+            except can.CanError:
+                pass #tx queue full, the bus is saturated
+        next_send += 0.01
+        time.sleep(max(0.0, next_send - time.monotonic()))
+    bus.shutdown()
+
+
+def write_traffic_log(path, rate, seconds, n_ids, filtered):
+    #Same traffic as send_traffic, as a CanLog file. filtered keeps only what the kernel filters would pass
+    ours = sorted(PyDashMain.CAN_DECODERS)
+    others = [i for i in range(0x080, 0x7FF) if i not in PyDashMain.CAN_DECODERS]
+    ids = ours + random.sample(others, max(0, n_ids - len(ours)))
+    filters = PyDashMain.build_can_filters(PyDashMain.CAN_DECODERS)
+    total = int(rate * seconds)
+    logger = CanLog.CanRingLogger(path, capacity=max(1, total))
+    for i in range(total):
+        msg = can.Message(timestamp=i / rate, arbitration_id=random.choice(ids),
+                          data=bytes(random.getrandbits(8) for _ in range(8)), is_extended_id=False)
+        if filtered and not any(msg.arbitration_id & f["can_mask"] == f["can_id"] & f["can_mask"] for f in filters):
+            continue
+        logger.log(msg)
+    logger.stop()
+
+
+def run_once(channel, rate, seconds, n_ids, filtered, replay=False):
+    if replay:
+        path = f"/tmp/canfilterbench_{'filtered' if filtered else 'all'}.pdcl"
+        if os.path.exists(path):
+            os.remove(path)
+        write_traffic_log(path, rate, seconds, n_ids, filtered)
+        bus = CanLog.ReplayBus(path, speed=1.0)
+        sender = None
+    else:
+        filters = PyDashMain.build_can_filters(PyDashMain.CAN_DECODERS) if filtered else None
+        bus = can.interface.Bus(channel=channel, interface='socketcan', can_filters=filters)
+        sender = multiprocessing.Process(target=send_traffic, args=(channel, rate, seconds, n_ids))
+    reader = PyDashMain.CanReader(bus)
+
+    cpu_start = time.process_time()
+    wake_start = resource.getrusage(resource.RUSAGE_SELF).ru_nvcsw
+    reader.start()
+    if sender:
+        sender.start()
+        sender.join()
+    else:
+        time.sleep(seconds)
+    time.sleep(0.2) #let the reader drain what is left
+    reader.stop()
+    reader.join()
+    cpu = time.process_time() - cpu_start
+    wakeups = resource.getrusage(resource.RUSAGE_SELF).ru_nvcsw - wake_start
+    bus.shutdown()
+
+    return {"cpu": cpu, "wakeups": wakeups, **reader.stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CPU and wakeups saved by the CAN kernel filters")
+    parser.add_argument("--channel", default="vcan0")
+    parser.add_argument("--rate", type=int, default=2000, help="frames per second to generate")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--ids", type=int, default=40, help="number of distinct IDs on the bus")
+    parser.add_argument("--replay", action="store_true", help="no vcan - replay the traffic through CanLog.ReplayBus")
+    args = parser.parse_args()
+
+    print(f"{args.rate} frames/s over {args.ids} IDs for {args.seconds}s on {'replay' if args.replay else args.channel}")
+    print("Filters:", PyDashMain.build_can_filters(PyDashMain.CAN_DECODERS))
+    results = {}
+    for name, filtered in (("unfiltered", False), ("filtered", True)):
+        results[name] = r = run_once(args.channel, args.rate, args.seconds, args.ids, filtered, args.replay)
+        print(f"{name:>10}: cpu {r['cpu']:.3f}s  ({100 * r['cpu'] / args.seconds:.1f}% of a core)  "
+              f"wakeups {r['wakeups']}  frames {r['received']}  dropped {r['dropped']}")
+
+    base, filt = results["unfiltered"], results["filtered"]
+    if base["cpu"] > 0 and base["wakeups"] > 0:
+        print(f"Saved {100 * (1 - filt['cpu'] / base['cpu']):.0f}% CPU and "
+              f"{100 * (1 - filt['wakeups'] / base['wakeups']):.0f}% of wakeups")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#CAN binary ring logger for PyDashMain
+
+"""
+CAN Ring Logger
+--------------------------------
+Every received frame is stored as a fixed 24 byte record in a preallocated, memory-mapped file:
+    timestamp (float64, kernel time) | arbitration id (uint32) | dlc (uint8) | flags (uint8) | 2 pad | 8 data bytes
+
+The file is a ring - once it is full the oldest frames get overwritten, so the SD card never fills up.
+Writing a frame is just a struct.pack_into into the mapped memory, a background thread msyncs the
+dirty pages and the header every FLUSH_INTERVAL seconds so nothing on the CAN or render path waits on the SD card.
+
+Export to candump/ASC (or anything python-can's Logger knows by file extension):
+    python3 CanLog.py export canlog.pdcl ride.log
+    python3 CanLog.py export canlog.pdcl ride.asc
+    python3 CanLog.py info canlog.pdcl
+
+Replay a recorded ride (this format or any python-can log: .log/.asc/.blf/.csv) onto a CAN interface,
+at recorded speed, N x speed, or as fast as possible (--speed 0):
+    python3 CanLog.py replay ride.pdcl vcan0 --speed 4
+The dash can also read a log directly as its CAN bus - see INPUT_MODE = "REPLAY" in PyDashMain.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import threading
+import time
+
+import can
+
+MAGIC = b"PDCL"
+VERSION = 1
+#magic, version, record size, capacity (records), total records ever written
+HEADER = struct.Struct("<4sHHIQ12x")
+RECORD = struct.Struct("<dIBB2x8s")
+
+FLAG_EXTENDED = 0x01
+FLAG_REMOTE = 0x02
+FLAG_ERROR = 0x04
+
+FLUSH_INTERVAL = 1.0 #seconds between msyncs
+REPLAY_BURST = 256 #frames in a row at --speed 0 before the bus goes quiet for one recv, so readers' drains end
+
+
+class CanRingLogger:
+    """
+    Opt-in logger fed from the CanReader thread.
+    log() only touches memory, flushing to disk happens in the logger's own thread.
+    An existing log file with the same capacity is continued, not wiped.
+    After stop() log() does nothing, so a reader that is still finishing a burst can't hit the closed map.
+    """
+
+    def __init__(self, path, capacity=1_000_000, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        size = HEADER.size + capacity * RECORD.size
+
+        count = 0
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size == size:
+                magic, version, record_size, old_capacity, old_count = HEADER.unpack(os.pread(fd, HEADER.size, 0))
+                if (magic, version, record_size, old_capacity) == (MAGIC, VERSION, RECORD.size, capacity):
+                    count = old_count
+            else:
+                os.ftruncate(fd, size)
+                if hasattr(os, "posix_fallocate"): #reserve the blocks now so logging never runs out of card
+                    os.posix_fallocate(fd, 0, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        self.count = count #frames written since the file was created
+        self._flushed = count
+        self.closed = False
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, RECORD.size, capacity, count)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._flush_loop, name="CanLogFlush", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def log(self, msg):
+        #Called for every frame - keep it to a single pack
+        if self.closed:
+            return
+        flags = (msg.is_extended_id and FLAG_EXTENDED) | (msg.is_remote_frame and FLAG_REMOTE) \
+            | (msg.is_error_frame and FLAG_ERROR)
+        offset = HEADER.size + (self.count % self.capacity) * RECORD.size
+        RECORD.pack_into(self._map, offset, msg.timestamp, msg.arbitration_id, msg.dlc, flags, msg.data)
+        self.count += 1
+
+    def flush(self):
+        count = self.count
+        if self.closed or count == self._flushed:
+            return
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, RECORD.size, self.capacity, count)
+        self._map.flush()
+        self._flushed = count
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def stop(self):
+        if self.closed:
+            return
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.flush()
+        self.closed = True
+        self._map.close()
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        magic, version, record_size, capacity, count = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a PyDash CAN log")
+    return capacity, count
+
+
+def iter_records(path):
+    """
+    Yields (timestamp, arbitration_id, dlc, flags, data) oldest first.
+    """
+    capacity, count = read_header(path)
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            n = min(count, capacity)
+            first = count % capacity if count > capacity else 0
+            for i in range(n):
+                yield RECORD.unpack_from(m, HEADER.size + ((first + i) % capacity) * RECORD.size)[:5]
+
+
+def iter_messages(path, channel=None):
+    #Same records as python-can messages
+    for timestamp, can_id, dlc, flags, data in iter_records(path):
+        yield can.Message(timestamp=timestamp, arbitration_id=can_id, dlc=dlc, data=data[:dlc],
+                          is_extended_id=bool(flags & FLAG_EXTENDED), is_remote_frame=bool(flags & FLAG_REMOTE),
+                          is_error_frame=bool(flags & FLAG_ERROR), channel=channel)
+
+
+def export(path, out_path, channel="can0"):
+    #python-can picks the writer from the extension: .log = candump, .asc = Vector ASC, .blf, .csv...
+    n = 0
+    with can.Logger(out_path) as writer:
+        for msg in iter_messages(path, channel):
+            writer.on_message_received(msg)
+            n += 1
+    return n
+
+
+def open_log(path, channel=None):
+    #Messages from either our ring format or anything python-can can read
+    if path.endswith(".pdcl"):
+        return iter_messages(path, channel)
+    return iter(can.LogReader(path))
+
+
+class ReplayBus(can.BusABC):
+    """
+    Drop-in stand-in for the socketcan bus that plays a recorded log back.
+    speed = 1 keeps the original inter-frame timing, 4 plays 4x faster, 0 as fast as recv() is called.
+    At speed 0 a non-blocking recv() comes back empty once every REPLAY_BURST frames, like a real bus between bursts.
+    can_filters are applied in software like the kernel would.
+    """
+
+    def __init__(self, path, speed=1.0, loop=False, channel="replay", can_filters=None, **kwargs):
+        super().__init__(channel=channel, can_filters=can_filters, **kwargs)
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.channel_info = f"replay of {path}"
+        self.frames_played = 0
+        self._burst = 0
+        self._closed = False
+        self._restart()
+
+    def _restart(self):
+        self._messages = open_log(self.path)
+        self._next = next(self._messages, None)
+        self._log_start = self._next.timestamp if self._next else 0.0
+        self._wall_start = time.monotonic()
+
+    @property
+    def finished(self):
+        return self._next is None
+
+    def _due(self, msg):
+        #monotonic time the frame should come out at
+        return self._wall_start + (msg.timestamp - self._log_start) / self.speed
+
+    def _recv_internal(self, timeout):
+        msg = self._next
+        if msg is None:
+            if self.loop and self.frames_played and not self._closed:
+                self._restart()
+                return self._recv_internal(timeout)
+            if timeout:
+                time.sleep(timeout) #end of log behaves like a silent bus
+            return None, False
+
+        if self.speed > 0:
+            wait = self._due(msg) - time.monotonic()
+            if wait > 0:
+                if timeout is not None and wait > timeout:
+                    time.sleep(timeout)
+                    return None, False
+                time.sleep(wait)
+        else:
+            self._burst += 1
+            if self._burst > REPLAY_BURST:
+                self._burst = 0
+                time.sleep(0) #give other threads the GIL
+                return None, False
+
+        self._next = next(self._messages, None)
+        self.frames_played += 1
+        return msg, False
+
+    def send(self, msg, timeout=None):
+        pass #nothing listens on a recording
+
+    def shutdown(self):
+        self._closed = True #stops a looping replay from starting over
+        self._next = None
+        super().shutdown()
+
+
+def replay(path, channel, interface="socketcan", speed=1.0, loop=False):
+    #Plays a log onto a real/virtual interface so the dash runs its normal socketcan path
+    source = ReplayBus(path, speed, loop)
+    with can.Bus(channel=channel, interface=interface) as bus:
+        try:
+            while True:
+                msg = source.recv(timeout=1.0)
+                if msg is None:
+                    if source.finished:
+                        break
+                    continue
+                bus.send(msg)
+        except KeyboardInterrupt:
+            pass
+    source.shutdown()
+    return source.frames_played
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PyDash CAN log tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("export", help="convert to candump .log / .asc / .blf / .csv")
+    p.add_argument("log")
+    p.add_argument("out")
+    p.add_argument("--channel", default="can0")
+    p = sub.add_parser("info", help="show how full a log is")
+    p.add_argument("log")
+    p = sub.add_parser("replay", help="play a log onto a CAN interface")
+    p.add_argument("log")
+    p.add_argument("channel")
+    p.add_argument("--interface", default="socketcan")
+    p.add_argument("--speed", type=float, default=1.0, help="1 = real time, 0 = as fast as possible")
+    p.add_argument("--loop", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        n = export(args.log, args.out, args.channel)
+        print(f"Exported {n} frames to {args.out}")
+    elif args.command == "info":
+        capacity, count = read_header(args.log)
+        print(f"{count} frames logged, {min(count, capacity)} of {capacity} slots in use")
+    elif args.command == "replay":
+        start = time.monotonic()
+        n = replay(args.log, args.channel, args.interface, args.speed, args.loop)
+        elapsed = time.monotonic() - start
+        print(f"Replayed {n} frames in {elapsed:.1f}s ({n / max(elapsed, 1e-9):.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,16 +8,217 @@ Use this to discover:
 - Raw data bytes
 - Message frequency
 - Which ID changes with RPM, Speed, etc.
+
+Default is a live table refreshed a few times a second, one row per ID:
+rate (Hz), period jitter (ms), DLC, last payload with the bytes that changed recently highlighted,
+and optionally (--bits) a per-bit "changed recently" mask.
+--raw prints every frame like the old sniffer did.
+--capture FILE writes every frame to a binary CanLog file at full bus rate, to be mapped to
+signals offline with CanAnalyze.py.
 """
 
 #Make sure bike is running when you run this program to get data
 
-import can
+import argparse
+import sys
 import time
+from array import array
+
+import can
+
+import CanLog
 
 CAN_CHANNEL = "can0"
 
+REFRESH_HZ = 4        #table redraws per second
+RECENT = 1.0          #seconds a byte/bit stays highlighted after it changed
+JITTER_ALPHA = 0.05   #smoothing for the period average / jitter
+DRAIN_FRAMES = 256    #a drain stops after this many frames or DRAIN_TIME seconds so a saturated bus still redraws
+DRAIN_TIME = 0.005
+
+#ANSI helpers for the in-place refresh
+HOME = "\x1b[H"
+CLEAR_EOL = "\x1b[K"
+CLEAR_EOS = "\x1b[J"
+HILITE = "\x1b[7m"
+RESET = "\x1b[0m"
+
+
+class IdStats:
+    """
+    Per-ID aggregates kept in flat arrays indexed by a slot number, so a frame only
+    costs a dict lookup and a few array writes no matter how busy the bus is.
+    """
+
+    def __init__(self):
+        self.slots = {}                  #arbitration id -> slot
+        self.ids = array("I")
+        self.count = array("Q")          #frames since start
+        self.window_count = array("I")   #frames since last redraw (for rate)
+        self.last_t = array("d")
+        self.period = array("d")         #smoothed period, s
+        self.jitter = array("d")         #smoothed |period - average|, s
+        self.dlc = array("B")
+        self.payload = bytearray()       #8 bytes per slot
+        self.byte_changed = array("d")   #8 timestamps per slot
+        self.bit_changed = array("d")    #64 timestamps per slot
+
+    def _new_slot(self, can_id):
+        slot = len(self.ids)
+        self.slots[can_id] = slot
+        self.ids.append(can_id)
+        self.count.append(0)
+        self.window_count.append(0)
+        self.last_t.append(0.0)
+        self.period.append(0.0)
+        self.jitter.append(0.0)
+        self.dlc.append(0)
+        self.payload.extend(bytes(8))
+        self.byte_changed.extend([0.0] * 8)
+        self.bit_changed.extend([0.0] * 64)
+        return slot
+
+    def add(self, msg):
+        slot = self.slots.get(msg.arbitration_id)
+        if slot is None:
+            slot = self._new_slot(msg.arbitration_id)
+        t = msg.timestamp
+
+        if self.count[slot]:
+            dt = t - self.last_t[slot]
+            if self.period[slot] == 0.0:
+                self.period[slot] = dt
+            else:
+                self.jitter[slot] += JITTER_ALPHA * (abs(dt - self.period[slot]) - self.jitter[slot])
+                self.period[slot] += JITTER_ALPHA * (dt - self.period[slot])
+        self.last_t[slot] = t
+        self.count[slot] += 1
+        self.window_count[slot] += 1
+        self.dlc[slot] = msg.dlc
+
+        #only walk the bytes/bits that actually flipped
+        base = slot * 8
+        first = self.count[slot] == 1
+        for i, b in enumerate(msg.data[:8]):
+            diff = self.payload[base + i] ^ b
+            if diff and not first:
+                self.byte_changed[base + i] = t
+                bit_base = (base + i) * 8
+                while diff:
+                    low = diff & -diff
+                    self.bit_changed[bit_base + low.bit_length() - 1] = t
+                    diff ^= low
+            self.payload[base + i] = b
+
+    def render(self, now, elapsed, show_bits):
+        lines = [f"{'ID':>8}  {'Hz':>7}  {'jit ms':>7}  DLC  Data" + ("" if not show_bits else " " * 22 + "Bits (7..0 per byte)"),
+                 ""]
+        for can_id in sorted(self.slots):
+            slot = self.slots[can_id]
+            rate = self.window_count[slot] / elapsed if elapsed > 0 else 0.0
+            self.window_count[slot] = 0
+            base = slot * 8
+            dlc = min(self.dlc[slot], 8)
+
+            cells = []
+            for i in range(dlc):
+                cell = f"{self.payload[base + i]:02X}"
+                if now - self.byte_changed[base + i] < RECENT:
+                    cell = HILITE + cell + RESET
+                cells.append(cell)
+            data = " ".join(cells) + "   " * (8 - dlc)
+
+            line = f"{can_id:>#8x}  {rate:7.1f}  {self.jitter[slot] * 1000:7.2f}  {dlc:>3}  {data}"
+            if show_bits:
+                groups = []
+                for i in range(dlc):
+                    bit_base = (base + i) * 8
+                    groups.append("".join("x" if now - self.bit_changed[bit_base + b] < RECENT else "."
+                                          for b in range(7, -1, -1)))
+                line += "   " + " ".join(groups)
+            lines.append(line)
+        return lines
+
+
+def run_stats(bus, hz, show_bits):
+    stats = IdStats()
+    interval = 1.0 / hz
+    last_draw = time.monotonic()
+    sys.stdout.write("\x1b[2J")
+    frames = 0
+
+    while True:
+        now = time.monotonic()
+        msg = bus.recv(timeout=max(0.0, last_draw + interval - now))
+        if msg is not None:
+            stats.add(msg)
+            frames += 1
+            #drain whatever is already queued before thinking about the screen (capped, the bus may never go quiet)
+            drain_end = time.monotonic() + DRAIN_TIME
+            for _ in range(DRAIN_FRAMES):
+                if time.monotonic() >= drain_end:
+                    break
+                msg = bus.recv(timeout=0)
+                if msg is None:
+                    break
+                stats.add(msg)
+                frames += 1
+
+        now = time.monotonic()
+        if now - last_draw >= interval:
+            #msg timestamps are kernel time - compare highlight ages against the same clock
+            lines = stats.render(time.time(), now - last_draw, show_bits)
+            lines.insert(0, f"CAN sniffer on {CAN_CHANNEL}: {len(stats.slots)} IDs, {frames} frames   (CTRL+C to stop)")
+            sys.stdout.write(HOME + (CLEAR_EOL + "\n").join(lines) + CLEAR_EOL + "\n" + CLEAR_EOS)
+            sys.stdout.flush()
+            last_draw = now
+
+
+def run_raw(bus):
+    while True:
+        msg = bus.recv(timeout=1)
+
+        if msg is None:
+            continue
+
+        # Pretty print message
+        data_str = " ".join([f"{b:02X}" for b in msg.data])
+        print(f"ID: 0x{msg.arbitration_id:03X}  DLC:{msg.dlc}  Data: {data_str}")
+
+
+def run_capture(bus, path, records):
+    #No decoding or printing per frame, just the mmap write - keeps up with a saturated bus
+    logger = CanLog.CanRingLogger(path, records).start()
+    print(f"Capturing to {path} (ring of {records} frames)")
+    last_print = time.monotonic()
+    try:
+        while True:
+            msg = bus.recv(timeout=0.5)
+            if msg is not None:
+                logger.log(msg)
+            now = time.monotonic()
+            if now - last_print >= 1.0:
+                sys.stdout.write(f"\r{logger.count} frames captured" + CLEAR_EOL)
+                sys.stdout.flush()
+                last_print = now
+    finally:
+        logger.stop()
+        print(f"\nSaved {logger.count} frames to {path}")
+
+
 def main():
+    global CAN_CHANNEL
+    parser = argparse.ArgumentParser(description="CAN sniffer")
+    parser.add_argument("--channel", default=CAN_CHANNEL)
+    parser.add_argument("--raw", action="store_true", help="print every frame instead of the stats table")
+    parser.add_argument("--bits", action="store_true", help="show the per-bit changed mask")
+    parser.add_argument("--hz", type=float, default=REFRESH_HZ, help="table refresh rate")
+    parser.add_argument("--capture", metavar="FILE", help="write every frame to a binary capture file")
+    parser.add_argument("--records", type=int, default=10_000_000,
+                        help="capture ring size in frames (24 bytes each, default ~40 min of a busy bus)")
+    args = parser.parse_args()
+    CAN_CHANNEL = args.channel
+
     print("Starting CAN sniffer...")
     print("Press CTRL+C to stop.\n")
 
@@ -27,20 +228,17 @@ def main():
         print("ERROR: Could not connect to CAN bus:", e)
         return
 
-    while True:
-        try:
-            msg = bus.recv(timeout=1)
-
-            if msg is None:
-                continue
-
-            # Pretty print message
-            data_str = " ".join([f"{b:02X}" for b in msg.data])
-            print(f"ID: 0x{msg.arbitration_id:03X}  DLC:{msg.dlc}  Data: {data_str}")
-
-        except KeyboardInterrupt:
-            print("\nSniffer stopped by user.")
-            break
+    try:
+        if args.capture:
+            run_capture(bus, args.capture, args.records)
+        elif args.raw:
+            run_raw(bus)
+        else:
+            run_stats(bus, args.hz, args.bits)
+    except KeyboardInterrupt:
+        print("\nSniffer stopped by user.")
+    finally:
+        bus.shutdown()
 
 if __name__ == "__main__":
     main()
@@ -4,10 +4,25 @@
 
 # Imported libraries
 import time
+BOOT_T0 = time.perf_counter() #key-on, every boot phase is timed from here
+import os
+import sys
 import pygame
 import serial
 import can
 import math
+import CanLog
+import SerialTest
+import threading
+import queue
+import struct
+import binascii
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+from collections import OrderedDict, deque, namedtuple
+from bisect import bisect_left, bisect_right
+from array import array
+from itertools import islice
 #RTC Libs
 #import board
 #import busio
@@ -15,31 +30,53 @@ import math
 #from datetime import datetime
 
 # ============================================================
-#              INPUT MODE ("REAL" or "FAKE")
+#              INPUT MODE ("REAL", "FAKE" or "REPLAY")
 # ============================================================
 #Real input mode is normal operations, fake is for generated data from single arduino for GUI setup
+#Replay feeds a recorded CAN log (CanLog .pdcl, candump .log, .asc...) in place of the bus, no CAN hat needed
 INPUT_MODE = "REAL"  # <-- CHANGE THIS ONE VARIABLE
+REPLAY_FILE = "canlog.pdcl"
+REPLAY_SPEED = 1.0   #1 = recorded timing, 4 = 4x faster, 0 = as fast as possible (decode throughput test)
+REPLAY_LOOP = True
 
 # ============================================================
 #                  USER SETUP
 # ============================================================
+#Fonts - looked up once at boot, each size is loaded the first time it is drawn
+FONT_NAME = "Arial"
+FONT_FILE = None #full path to the .ttf to skip the system font lookup, e.g. "/usr/share/fonts/truetype/msttcorefonts/Arial.ttf"
+
 #Image imports
 IMAGE_DIR = "images/"
 SPLASH_IMAGE = IMAGE_DIR + "splash.jpg"
 BG_IMAGE = IMAGE_DIR + "mainback.jpg"
 
+#Serial ports - "AUTO" scans every USB serial port at boot and picks each Arduino by what it sends (see SerialTest.py)
+#or set a fixed path, e.g. "/dev/serial/by-path/platform-fd500000.pcie-pci-0000:01:00.0-usb-0:1.2:1.0-port0", "COM6" on windows
 #Arduino 1
-SERIAL_PORT1 = "/dev/serial/by-path/platform-fd500000.pcie-pci-0000:01:00.0-usb-0:1.2:1.0-port0" #"COM6" on windows
+SERIAL_PORT1 = "AUTO"
 SERIAL_BAUD1 = 115200
 
 #Arduino BTNs
-SERIAL_PORT2 = "COM3" #"/dev/serial/by-path/platform-fd500000.pcie-pci-0000:01:00.0-usb-0:1.3:1.0-port0" #"COM3" on windows
+SERIAL_PORT2 = "AUTO" #"/dev/serial/by-path/platform-fd500000.pcie-pci-0000:01:00.0-usb-0:1.3:1.0-port0"
 SERIAL_BAUD2 = 115200
 
+#seconds the boot scan listens on each port, keeps boot inside BOOT_BUDGET
+#anything slower (late plug-in, slow bootloader, the fake generator's 5s banner delay) is found by the background rescans
+SERIAL_PROBE_BOOT = 2.5
+
 #CAN Channel
 CAN_CHANNEL = "can0"
 CAN_BITRATE = 500000
+CAN_SNIFF_ALL = False #True = no kernel filters, every frame on the bus reaches python (for sniffing/logging)
+CAN_LOG_FILE = None #e.g. "/home/pi/canlog.pdcl" to log every received frame (set CAN_SNIFF_ALL to log the whole bus)
+CAN_LOG_RECORDS = 2_000_000 #ring size in frames, 24 bytes each (~48MB, over 8 min of a saturated bus)
 FPS = 30
+SAMPLE_RATE = 50 #Hz, the G dot and throttle trails are sampled at this rate whatever screen is up
+BOOT_BUDGET = 4.0 #seconds from start to a usable dash, a warning is printed when boot takes longer
+DEBUG_DIRTY = False #outline the regions pushed to the display each frame (toggle with the D key)
+ACQUISITION_PROCESS = False #True = CAN, IMU and buttons are read in their own process (own core), main() only renders
+ACQ_POLL = 0.002 #seconds between IMU reads / shared memory updates in the acquisition process
 
 #CAN IDs
 CAN_ID_RPM = 0x100
@@ -49,6 +86,22 @@ CAN_ID_COOLANT = 0x103
 CAN_ID_IAT = 0x104
 CAN_ID_TPS = 0x105
 
+#CAN signal table (DBC style), one row per decoded value
+#name must be one of TELEMETRY_FIELDS
+#start_byte/length are in bytes (1, 2 or 4), start_bit/bit_length pick a bit field out of that value (None = whole value)
+#value = raw * scale + offset
+CanSignal = namedtuple("CanSignal",
+                       "name can_id start_byte length byte_order signed scale offset start_bit bit_length",
+                       defaults=("big", False, 1, 0, None, None))
+
+CAN_SIGNALS = [
+    CanSignal("rpm",     CAN_ID_RPM,     0, 2),
+    CanSignal("speed",   CAN_ID_SPEED,   0, 1),
+    CanSignal("gear",    CAN_ID_GEAR,    0, 1),
+    CanSignal("coolant", CAN_ID_COOLANT, 0, 1),
+    CanSignal("iat",     CAN_ID_IAT,     0, 1),
+    CanSignal("tps",     CAN_ID_TPS,     0, 1),
+]
 
 #i2c = busio.I2C(board.SCL, board.SDA)
 #rtc = adafruit_pcf8523.PCF8523(i2c)
@@ -83,54 +136,213 @@ canString = ""
 serArdString = ""
 serBtnString = ""
 
-#Can vars
-rpm = 0
-speed = 0
-gear = 0
-coolant = 0
-iat = 0
-tps = 0
-
-# IMU / Arduino variables
-imu_data = { #these are the only variables im importing for now, more can be added later if i find a reason
-    "ax": 0, "ay": 0,
-    "lean": 0, "pitch": 0,
-    "brake": 0
-}
+#BTN timing (seconds)
+BTN_DEBOUNCE = 0.03        #transitions closer than this to the last one are contact bounce
+BTN_SHORT = 0.1            #shortest press that counts
+BTN_LONG = 3.0             #held this long = long press, fires while still held
+BTN_REPEAT_INTERVAL = 0.25 #after a long press, repeat events this often while held
+
+
+#g history for g_dot usage is the g_history RingSeries in the G DOT section, filled by the sampler (TELEMETRY SAMPLER)
+
+#Trail Graph Handling
+TRAIL_WINDOWS = (20.0, 120.0, 600.0) #seconds, long press the black button on the Trail screen to cycle
+trail_window = 0 #index into TRAIL_WINDOWS
+graph_duration = TRAIL_WINDOWS[trail_window] #seconds
+TRAIL_LEAN_RANGE = 50 #degrees = 100%
+TRAIL_BRAKE_RANGE = 1000 #psi = 100% (sensor reads 0-1900 psi)
+#lean_history, brake_history, throttle_history are TrailHistory objects, see TRAILING GRAPH LINES
+
 
+# ============================================================
+#               TELEMETRY STATE
+# ============================================================
+
+#Every live value lives in one TelemetryState object. The CAN thread, the button thread and the IMU reading in the
+#main loop each publish their values through telemetry.publish(), the render loop takes telemetry.front once per frame.
 #y long
 #x lat
 #z vert
 #Remember the orientation -- and remember to correct the lateral values for lean on the arduino
 
+TELEMETRY_FIELDS = (
+    "rpm", "speed", "gear", "coolant", "iat", "tps",  #CAN
+    "lean", "ax", "ay", "brake",                      #IMU, newest sample
+    "maxg", "maxl", "maxr", "maxbrake",               #peaks - max G, max left lean (negative), max right lean, max brake
+    "btn1", "btn2",                                   #black / red button, 0 = pressed, 1 = released
+)
 
 
-#Max values have to be definied globally to prevent overwriting within functions
-maxg = 0 #Max GForces
-maxl = 0 #Max left lean
-maxr = 0 #max right lean
-maxbrake = 0 #Maximum brake pressure
+class TelemetryState:
+    """
+    One consistent set of live values.
+    A published state is never written to again - producers change a copy and swap it in (see Telemetry),
+    so the renderer can read a state for a whole frame without locking.
+    """
+    __slots__ = TELEMETRY_FIELDS + ("seq",)
 
-#BTN variables
-btn1_state = 1  #Black btn, 0 = pressed, 1 = released
-btn2_state = 1  #Red btn, same states
-btn1_short_press = False
-btn1_long_press = False
-btn2_short_press = False
-btn2_long_press = False
-_btn1_press_start = None
-_btn2_press_start = None
-btn_serial = None  # Serial 2 object
+    def __init__(self):
+        for name in TELEMETRY_FIELDS:
+            setattr(self, name, 0)
+        self.btn1 = self.btn2 = 1
+        self.seq = 0 #number of publishes so far
 
+    def copy(self):
+        state = TelemetryState.__new__(TelemetryState)
+        for name in self.__slots__:
+            setattr(state, name, getattr(self, name))
+        return state
 
-#saving g history for g_dot usage
-g_history = [] #(timestamp, x, y)
 
-#Trail Graph Handling
-graph_duration = 20.0 #seconds
-lean_history = [] #list of (timestamp, value)
-brake_history = []
-throttle_history = []
+class Telemetry:
+    """
+    Double buffered live values.
+    front is the published TelemetryState - read it once and use that object for the whole frame.
+    publish() writes into a back copy of front and makes it the new front with a single reference assignment.
+    The lock only keeps two producers from publishing over each other, readers never take it.
+    """
+
+    def __init__(self):
+        self.front = TelemetryState()
+        self._lock = threading.Lock()
+
+    def publish(self, values):
+        #values is {field: value}, only the fields that changed
+        with self._lock:
+            back = self.front.copy()
+            for name, value in values.items():
+                setattr(back, name, value)
+            back.seq += 1
+            self.front = back
+
+
+telemetry = Telemetry()
+
+
+# ============================================================
+#               TIME SERIES STORE
+# ============================================================
+
+#Every on-screen history (G dot trail, trail graph levels) is a RingSeries out of series_store.
+#Each one is preallocated at startup, so the memory they use is fixed and known before the first sample.
+
+
+class RingSeries:
+    """
+    Fixed size ring of samples: a timestamp column plus one array("d") column per value, oldest first.
+    Timestamps must not go backwards - every series is stamped with time.monotonic(), never the wall clock,
+    which NTP or the RTC can step back at boot. When full the oldest sample is overwritten, nothing is allocated after construction.
+    append() is O(1), since()/after() find a time in O(log n) by bisecting the timestamps,
+    views() hands out memoryviews of the columns - no copying, at most two pieces because of the wrap.
+    """
+    __slots__ = ("name", "names", "t", "columns", "capacity", "start", "count")
+
+    def __init__(self, name, capacity, names):
+        self.name = name
+        self.names = names #value column names, in the order append() and views() use
+        self.capacity = capacity
+        self.t = array("d", bytes(8 * capacity))
+        self.columns = [array("d", bytes(8 * capacity)) for _ in names]
+        self.start = 0
+        self.count = 0
+
+    def append(self, t, *values):
+        cap = self.capacity
+        i = self.start + self.count
+        if i >= cap:
+            i -= cap
+        if self.count == cap:
+            self.start = i + 1 if i + 1 < cap else 0
+        else:
+            self.count += 1
+        self.t[i] = t
+        for column, value in zip(self.columns, values):
+            column[i] = value
+
+    def _find(self, t, search):
+        #position of t in the ring (0 = oldest), the two sorted runs either side of the wrap are bisected separately
+        start, end, cap = self.start, self.start + self.count, self.capacity
+        if end <= cap:
+            return search(self.t, t, start, end) - start
+        i = search(self.t, t, start, cap)
+        if i < cap:
+            return i - start
+        return cap - start + search(self.t, t, 0, end - cap)
+
+    def since(self, t):
+        #index of the first sample at or after t (len(self) if there is none)
+        return self._find(t, bisect_left)
+
+    def after(self, t):
+        #index of the first sample newer than t
+        return self._find(t, bisect_right)
+
+    def expire(self, cutoff):
+        #Drops samples older than cutoff
+        drop = self.since(cutoff)
+        if drop:
+            self.start = (self.start + drop) % self.capacity
+            self.count -= drop
+
+    def views(self, first=0):
+        """
+        Samples from index first to the newest as [(t, column, ...)] memoryview pieces, oldest piece first.
+        The views share the ring's memory - use them straight away, later appends overwrite them.
+        """
+        if first >= self.count:
+            return []
+        lo = self.start + first
+        end = self.start + self.count
+        cap = self.capacity
+        if lo >= cap:
+            pieces = [(lo - cap, end - cap)]
+        elif end <= cap:
+            pieces = [(lo, end)]
+        else:
+            pieces = [(lo, cap), (0, end - cap)]
+        arrays = [memoryview(self.t)] + [memoryview(column) for column in self.columns]
+        return [tuple(view[a:b] for view in arrays) for a, b in pieces]
+
+    def newest(self):
+        #(t, value, ...) of the last sample, None when empty
+        if not self.count:
+            return None
+        i = (self.start + self.count - 1) % self.capacity
+        return (self.t[i],) + tuple(column[i] for column in self.columns)
+
+    def clear(self):
+        self.start = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def nbytes(self):
+        return 8 * self.capacity * (1 + len(self.columns))
+
+
+class TimeSeriesStore:
+    """
+    All the RingSeries, by name. Series are sized when they are created, nbytes() is everything they will ever use.
+    """
+
+    def __init__(self):
+        self.series = {}
+
+    def add(self, name, capacity, names=("v",)):
+        if name in self.series:
+            raise ValueError(f"time series {name!r} already exists")
+        series = self.series[name] = RingSeries(name, capacity, names)
+        return series
+
+    def nbytes(self):
+        return sum(series.nbytes() for series in self.series.values())
+
+    def stats(self):
+        return f"{len(self.series)} series, {self.nbytes() / 1024:.0f} kB preallocated"
+
+
+series_store = TimeSeriesStore()
 
 
 # ============================================================
@@ -144,8 +356,15 @@ def init_can():
         print(canString)
         return None
     try:
-        bus = can.interface.Bus(channel=CAN_CHANNEL, bustype='socketcan')
-        canString = "[CAN] Connected."
+        #kernel only wakes us up for IDs we decode, unless sniffing everything
+        filters = None if CAN_SNIFF_ALL else build_can_filters(CAN_DECODERS)
+        if INPUT_MODE == "REPLAY": #recorded log stands in for the bus, same filters applied in software
+            bus = CanLog.ReplayBus(REPLAY_FILE, REPLAY_SPEED, loop=REPLAY_LOOP, can_filters=filters)
+            canString = f"[CAN] REPLAY {REPLAY_FILE} x{REPLAY_SPEED}"
+            print(canString)
+            return bus
+        bus = can.interface.Bus(channel=CAN_CHANNEL, bustype='socketcan', can_filters=filters)
+        canString = "[CAN] Connected." if filters is None else f"[CAN] Connected. ({len(filters)} filters)"
         print(canString)
         return bus
     except Exception as e:
@@ -155,20 +374,213 @@ def init_can():
         return None
 
 
-def process_can_frame(msg):
-    global rpm, speed, gear, coolant, iat, tps #Process can data coming over, this stuff should work if CAN IDs are set correctly
-    if msg.arbitration_id == CAN_ID_RPM:
-        rpm = (msg.data[0] << 8) | msg.data[1]
-    elif msg.arbitration_id == CAN_ID_SPEED:
-        speed = msg.data[0]
-    elif msg.arbitration_id == CAN_ID_GEAR:
-        gear = msg.data[0]
-    elif msg.arbitration_id == CAN_ID_COOLANT:
-        coolant = msg.data[0]
-    elif msg.arbitration_id == CAN_ID_IAT:
-        iat = msg.data[0]
-    elif msg.arbitration_id == CAN_ID_TPS:
-        tps = msg.data[0]
+#struct codes per field size, (unsigned, signed)
+_CAN_FIELD_CODES = {1: ("B", "b"), 2: ("H", "h"), 4: ("I", "i")}
+
+
+def compile_can_signals(signals):
+    """
+    Compiles the signal table into {arbitration_id: (struct.Struct, fields)} so decoding a frame
+    is one dict lookup plus one unpack_from.
+    fields is a tuple of (name, value_index, shift, mask, scale, offset), mask is None for whole values.
+    Raises ValueError for unknown signal names and for signals that overlap or mix byte orders within one ID.
+    """
+    by_id = {}
+    for sig in signals:
+        if sig.name not in TELEMETRY_FIELDS:
+            raise ValueError(f"CAN signal {sig.name!r} is not a telemetry field")
+        by_id.setdefault(sig.can_id, []).append(sig)
+
+    decoders = {}
+    for can_id, sigs in by_id.items():
+        byte_orders = {sig.byte_order for sig in sigs if sig.length > 1}
+        if len(byte_orders) > 1:
+            raise ValueError(f"CAN ID 0x{can_id:03X} mixes byte orders")
+        prefix = "<" if byte_orders == {"little"} else ">"
+
+        #one struct field per distinct (start, length, signed) - bit fields share their parent value
+        slots = sorted({(sig.start_byte, sig.length, sig.signed) for sig in sigs})
+        fmt = prefix
+        pos = 0
+        for start, length, signed in slots:
+            if length not in _CAN_FIELD_CODES:
+                raise ValueError(f"CAN ID 0x{can_id:03X}: unsupported signal length {length}")
+            if start < pos:
+                raise ValueError(f"CAN ID 0x{can_id:03X}: overlapping signals at byte {start}")
+            if start > pos:
+                fmt += f"{start - pos}x"
+            fmt += _CAN_FIELD_CODES[length][signed]
+            pos = start + length
+        if pos > 8:
+            raise ValueError(f"CAN ID 0x{can_id:03X}: signals run past byte 8")
+
+        fields = []
+        for sig in sigs:
+            index = slots.index((sig.start_byte, sig.length, sig.signed))
+            if sig.bit_length is None:
+                shift, mask = 0, None
+            else:
+                shift, mask = sig.start_bit or 0, (1 << sig.bit_length) - 1
+            fields.append((sig.name, index, shift, mask, sig.scale, sig.offset))
+        decoders[can_id] = (struct.Struct(fmt), tuple(fields))
+    return decoders
+
+
+def _merge_can_ids(ids, full_mask):
+    """
+    Merges IDs into (id, mask) pairs that match exactly the given IDs and nothing else.
+    Two pairs with the same mask whose IDs differ in a single bit become one pair with that bit masked out,
+    repeated until nothing merges (0x100-0x103 -> 0x100/0x7FC).
+    """
+    pairs = {(can_id, full_mask) for can_id in ids}
+    merged = True
+    while merged:
+        merged = False
+        for a_id, a_mask in sorted(pairs):
+            for b_id, b_mask in sorted(pairs):
+                diff = a_id ^ b_id
+                if a_mask == b_mask and diff and diff & (diff - 1) == 0 and a_id < b_id:
+                    pairs -= {(a_id, a_mask), (b_id, b_mask)}
+                    pairs.add((a_id, a_mask & ~diff))
+                    merged = True
+                    break
+            if merged:
+                break
+    return sorted(pairs)
+
+
+def build_can_filters(decoders):
+    """
+    Builds python-can/SocketCAN can_filters for every ID in the decoder table, merged into
+    mask/ID pairs where that doesn't let extra IDs through.
+    """
+    std_ids = [can_id for can_id in decoders if can_id <= 0x7FF]
+    ext_ids = [can_id for can_id in decoders if can_id > 0x7FF]
+    filters = [{"can_id": can_id, "can_mask": mask, "extended": False}
+               for can_id, mask in _merge_can_ids(std_ids, 0x7FF)]
+    filters += [{"can_id": can_id, "can_mask": mask, "extended": True}
+                for can_id, mask in _merge_can_ids(ext_ids, 0x1FFFFFFF)]
+    return filters
+
+
+#compiled once at startup
+CAN_DECODERS = compile_can_signals(CAN_SIGNALS)
+
+
+def process_can_frame(msg, values):
+    #Process can data coming over, this stuff should work if CAN IDs are set correctly in CAN_SIGNALS
+    #decoded values go into values ({field: value}), published by the caller
+    decoder = CAN_DECODERS.get(msg.arbitration_id)
+    if decoder is None: #not one of ours
+        return False
+    unpacker, fields = decoder
+    try:
+        raw = unpacker.unpack_from(msg.data)
+    except struct.error: #frame shorter than the signal table expects
+        return False
+    for name, index, shift, mask, scale, offset in fields:
+        value = raw[index]
+        if mask is not None:
+            value = (value >> shift) & mask
+        values[name] = value * scale + offset
+    return True
+
+#a drain that never runs dry (saturated bus, fast replay) still publishes every this many frames / seconds
+CAN_PUBLISH_FRAMES = 256
+CAN_PUBLISH_INTERVAL = 0.005
+
+
+class CanReader(threading.Thread):
+    """
+    Background CAN acquisition thread.
+    Blocks on the bus, then drains every pending frame through process_can_frame and publishes
+    the decoded values (rpm, speed, gear...) to telemetry once per burst, so they are always the newest the ECU has sent.
+    Long bursts are published in pieces (CAN_PUBLISH_FRAMES / CAN_PUBLISH_INTERVAL).
+    The render loop just reads those values, it never waits on the bus.
+
+    Counters:
+    frames_received - every frame pulled off the bus
+    frames_dropped  - error frames, IDs not in CAN_SIGNALS and frames too short to decode
+    queue_depth     - frames that were already waiting when the last burst was drained
+    max_queue_depth - worst backlog seen since startup
+    """
+
+    def __init__(self, bus, timeout=0.1, logger=None, on_lost=None):
+        super().__init__(name="CanReader", daemon=True)
+        self.bus = bus #None while disconnected, the connection supervisor swaps a new one in
+        self.logger = logger #optional CanLog.CanRingLogger, gets every frame before decoding
+        self.on_lost = on_lost #called with the failed bus when it errors
+        self.timeout = timeout #blocking wait per recv, only limits how fast stop() is noticed
+        self.frames_received = 0
+        self.frames_dropped = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self._running = threading.Event()
+
+    def run(self):
+        self._running.set()
+        while self._running.is_set():
+            bus = self.bus
+            if bus is None: #waiting on a reconnect
+                time.sleep(self.timeout)
+                continue
+            decoded = {}
+            try:
+                msg = bus.recv(timeout=self.timeout)
+                if msg is None:
+                    continue
+
+                #first frame woke us up, now drain everything already sitting in the socket buffer
+                depth = 0
+                pending = 0
+                publish_at = time.perf_counter() + CAN_PUBLISH_INTERVAL
+                while msg is not None and self._running.is_set():
+                    self._handle(msg, decoded)
+                    pending += 1
+                    if pending >= CAN_PUBLISH_FRAMES or time.perf_counter() >= publish_at:
+                        if decoded:
+                            telemetry.publish(decoded)
+                            decoded.clear()
+                        pending = 0
+                        publish_at = time.perf_counter() + CAN_PUBLISH_INTERVAL
+                    msg = bus.recv(timeout=0)
+                    if msg is not None:
+                        depth += 1
+            except (can.CanError, OSError) as e:
+                print("[CAN ERROR]", e)
+                if self.on_lost:
+                    self.on_lost(bus)
+                else:
+                    time.sleep(self.timeout)
+                continue
+            finally:
+                if decoded: #end of the burst, including what came in before an error
+                    telemetry.publish(decoded)
+
+            self.queue_depth = depth
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+
+    def _handle(self, msg, decoded):
+        self.frames_received += 1
+        if self.logger:
+            self.logger.log(msg)
+        if msg.is_error_frame:
+            self.frames_dropped += 1
+            return
+        if not process_can_frame(msg, decoded): #unknown ID or short frame
+            self.frames_dropped += 1
+
+    def stop(self):
+        self._running.clear()
+
+    def stats(self):
+        return {
+            "received": self.frames_received,
+            "dropped": self.frames_dropped,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+        }
 
 
 # ============================================================
@@ -176,6 +588,7 @@ def process_can_frame(msg):
 # ============================================================
 
 def init_serial():
+    global serArdString
     try:
         ser = serial.Serial(
             SERIAL_PORT1,
@@ -183,14 +596,17 @@ def init_serial():
             timeout=0.01      # smaller timeout = more processing, better data refresh
         )
         ser.reset_input_buffer()
-        print("[SERIAL] IMU connected")
+        serArdString = f"[SERIAL] IMU connected ({SERIAL_PORT1})"
+        print(serArdString)
         return ser
 
     except serial.SerialException as e:
-        print(f"[SERIAL ERROR] IMU failed: {e}")
+        serArdString = "[SERIAL ERROR] IMU failed"
+        print(serArdString, e)
         return None
 
 def init_button_serial():
+    global serBtnString
     try:
         ser = serial.Serial(
             SERIAL_PORT2,
@@ -198,126 +614,983 @@ def init_button_serial():
             timeout=0.01      #same timeout relation
         )
         ser.reset_input_buffer()
-        print("[SERIAL-BTN] Connected")
+        serBtnString = f"[SERIAL-BTN] Connected ({SERIAL_PORT2})"
+        print(serBtnString)
         return ser
 
     except serial.SerialException as e:
-        print(f"[SERIAL-BTN ERROR] Could not connect: {e}")
+        serBtnString = "[SERIAL-BTN ERROR] Could not connect"
+        print(serBtnString, e)
         return None
 
 
 
+#IMU serial buffer - reused every frame, only ever holds the unread tail of the stream
+IMU_BUF_SIZE = 4096 #~40 lines of IMU CSV, anything older than that is stale anyway
+_imu_buf = bytearray(IMU_BUF_SIZE)
+_imu_view = memoryview(_imu_buf)
+_imu_fill = 0            #bytes in use
+_imu_line_start = True   #False when byte 0 is somewhere in the middle of a line (after skipping a backlog)
+
+#incoming CSV key -> imu_sample key, these are the only keys parsed
+IMU_KEYS = {b"LEAN": "lean", b"BRK": "brake", b"AX": "ax", b"AY": "ay"}
+#newest values parsed off the IMU serial, a CSV line doesn't have to carry every key so the rest carry over
+#only the serial reading touches this, everything else reads the copy published to telemetry
+imu_sample = {"lean": 0, "ax": 0, "ay": 0, "brake": 0}
+
+#Binary IMU packet (BINARY_PROTOCOL 1 in IMU_TRA.ino / Fake_DASH_input.ino)
+#COBS framed, ends in a 0x00 byte, decoded it is:
+#sync 0xA5 | type | seq | lean, ax, ay, brake (float32 little endian) | CRC-16/CCITT of everything before it
+#Old firmware sends key:value CSV lines instead, read_serial tells them apart by the 0x00 delimiter
+IMU_SYNC = 0xA5
+IMU_PACKET_TYPE = 0x01
+IMU_PACKET = struct.Struct("<BBB4fH")
+IMU_DECIMALS = 2 #float32 values are rounded to what the CSV firmware prints (Serial.print default), so both protocols draw the same
+_imu_seq = None #last sequence number seen
+_imu_binary = False #True once the IMU has sent a binary packet
+imu_stats = {"packets": 0, "lost": 0, "bad": 0} #binary link health
+
+
+class ImuBatch:
+    """
+    Every IMU sample received since the last read_serial call, one array per channel.
+    Serial has no sensor clock, so t spreads the samples evenly between the previous read and this one.
+    The same object is reused every frame.
+    """
+    __slots__ = ("t", "lean", "ax", "ay", "brake", "last_t")
+
+    def __init__(self):
+        self.t = array("d")
+        self.lean = array("d")
+        self.ax = array("d")
+        self.ay = array("d")
+        self.brake = array("d")
+        self.last_t = time.monotonic()
+
+    def clear(self):
+        for col in (self.t, self.lean, self.ax, self.ay, self.brake):
+            del col[:]
+
+    def append_current(self):
+        #one sample from whatever is in imu_sample now
+        self.lean.append(imu_sample["lean"])
+        self.ax.append(imu_sample["ax"])
+        self.ay.append(imu_sample["ay"])
+        self.brake.append(imu_sample["brake"])
+
+    def stamp(self, now, airtime):
+        #airtime = how long the batch's bytes took on the wire, the samples can't be older than that
+        #(after a reconnect or an outage the gap since last_t held no data)
+        n = len(self.lean)
+        if not n:
+            return
+        first = max(self.last_t, now - airtime)
+        step = (now - first) / n
+        self.t.extend(first + step * (i + 1) for i in range(n))
+        self.last_t = now
+
+    def __len__(self):
+        return len(self.lean)
+
+
+imu_batch = ImuBatch()
+
+
 def read_serial(ser):
-    global imu_data
+    """
+    Pulls everything waiting on the IMU serial in one read and parses every complete
+    line (CSV) or packet (binary) in it. The unfinished tail is kept for the next call.
+    Returns imu_batch holding all of those samples (imu_sample ends up as the newest one),
+    or None when nothing new came in. The batch is bounded by IMU_BUF_SIZE.
+    """
+    global _imu_fill, _imu_line_start, _imu_seq, _imu_binary
 
     if not ser:
-        return
+        return None
 
-    latest_line = None
+    waiting = ser.in_waiting
+    if not waiting:
+        return None
 
-    #Read all available lines and keep only the latest
-    while ser.in_waiting:
+    #more waiting than fits - throw the old bytes away, the buffer drains far faster than 115200 baud so this
+    #only happens after a stall
+    if waiting > IMU_BUF_SIZE - _imu_fill:
+        _imu_fill = 0
+        _imu_line_start = False
+        _imu_seq = None #we dropped those packets ourselves, don't count them as lost
+        while waiting > IMU_BUF_SIZE:
+            waiting -= ser.readinto(_imu_view[:min(waiting - IMU_BUF_SIZE, IMU_BUF_SIZE)])
+
+    #exactly what is waiting, so this never sits in the serial timeout
+    _imu_fill += ser.readinto(_imu_view[_imu_fill:_imu_fill + waiting])
+
+    #binary packets end in 0x00, which never shows up in the CSV
+    #once one is seen stay binary, a half received packet can hold a 0x0A that looks like a line end
+    end = _imu_buf.rfind(b"\x00", 0, _imu_fill)
+    if end >= 0:
+        _imu_binary = True
+    elif not _imu_binary:
+        end = _imu_buf.rfind(b"\n", 0, _imu_fill)
+    binary = _imu_binary
+    if end < 0:
+        if _imu_fill == IMU_BUF_SIZE: #a buffer full of no delimiters is junk, start over
+            _imu_fill = 0
+            _imu_line_start = False
+            _imu_binary = False
+        return None
+
+    records = bytes(_imu_view[:end]).split(b"\x00" if binary else b"\n")
+    if not _imu_line_start: #first one is the back half of something we skipped
+        del records[0]
+
+    #carry the partial line over to the front of the buffer
+    tail = _imu_fill - end - 1
+    _imu_buf[:tail] = _imu_view[end + 1:_imu_fill]
+    _imu_fill = tail
+    _imu_line_start = True
+
+    imu_batch.clear()
+    parse = parse_imu_packet if binary else parse_imu_line
+    for record in records:
+        if record and parse(record):
+            imu_batch.append_current()
+    imu_batch.stamp(time.monotonic(), (end + 1) * 10 / SERIAL_BAUD1) #8N1 = 10 bits a byte
+    return imu_batch if len(imu_batch) else None
+
+
+def parse_imu_line(line):
+    #this loop checks for "keys" from incoming CSV, key must match for data to be collected
+    #returns True if the line held at least one value
+    found = False
+    for p in line.split(b","):
+        key, sep, value = p.partition(b":")
+        if not sep:
+            continue
+        name = IMU_KEYS.get(key.strip())
+        if name is None:
+            continue
         try:
-            latest_line = ser.readline().decode(errors="ignore").strip()
-        except:
+            imu_sample[name] = float(value)
+            found = True
+        except ValueError:
             continue
+    return found
+
+
+def cobs_decode(data):
+    #Undo COBS framing (delimiter already stripped), raises ValueError on a broken frame
+    out = bytearray()
+    i = 0
+    n = len(data)
+    while i < n:
+        code = data[i]
+        if code == 0 or i + code > n:
+            raise ValueError("bad COBS frame")
+        out += data[i + 1:i + code]
+        i += code
+        if code < 0xFF and i < n:
+            out.append(0)
+    return out
+
+
+def parse_imu_packet(frame):
+    """
+    Decodes one binary IMU packet into imu_sample, returns False for a corrupt packet.
+    Sequence number gaps are counted as lost packets.
+    """
+    global _imu_seq
+    try:
+        raw = cobs_decode(frame)
+    except ValueError:
+        imu_stats["bad"] += 1
+        return False
+    if len(raw) != IMU_PACKET.size:
+        imu_stats["bad"] += 1
+        return False
+    sync, ptype, seq, lean, ax, ay, brake, crc = IMU_PACKET.unpack_from(raw)
+    if sync != IMU_SYNC or ptype != IMU_PACKET_TYPE or crc != binascii.crc_hqx(raw[:-2], 0xFFFF):
+        imu_stats["bad"] += 1
+        return False
+
+    if _imu_seq is not None:
+        imu_stats["lost"] += (seq - _imu_seq - 1) & 0xFF
+    _imu_seq = seq
+    imu_stats["packets"] += 1
+
+    imu_sample["lean"] = round(lean, IMU_DECIMALS)
+    imu_sample["ax"] = round(ax, IMU_DECIMALS)
+    imu_sample["ay"] = round(ay, IMU_DECIMALS)
+    imu_sample["brake"] = round(brake, IMU_DECIMALS)
+    return True
+
+
+def reset_imu_stream(ser=None):
+    #New IMU connection - drop the partial line and sequence tracking from the old one
+    global _imu_fill, _imu_line_start, _imu_seq, _imu_binary
+    _imu_fill = 0
+    _imu_line_start = False
+    _imu_seq = None
+    _imu_binary = False
+    imu_batch.last_t = time.monotonic()
+
+
+def consume_imu_batch(batch, history=True):
+    """
+    Runs a whole batch of IMU samples through the peak trackers and trail histories in one pass,
+    so short spikes between frames still count. The newest sample and any new peaks are published to telemetry.
+    history=False leaves the trail histories alone (the acquisition process, the render process keeps those).
+    """
+    prev = telemetry.front
+    values = {"lean": batch.lean[-1], "ax": batch.ax[-1], "ay": batch.ay[-1], "brake": batch.brake[-1]}
+
+    #peaks
+    peak_g = max(map(math.hypot, batch.ax, batch.ay))
+    if peak_g > prev.maxg:
+        values["maxg"] = round(peak_g, 3)
+    hi = max(batch.lean)
+    if hi > prev.maxr:
+        values["maxr"] = round(abs(hi))
+    lo = min(batch.lean)
+    if lo < prev.maxl: #whoop
+        values["maxl"] = round(lo)
+    peak_brake = max(batch.brake)
+    if peak_brake > prev.maxbrake:
+        values["maxbrake"] = peak_brake
+    telemetry.publish(values)
+    if history:
+        add_imu_history(zip(batch.t, batch.lean, batch.ax, batch.ay, batch.brake))
+
+
+def add_imu_history(samples):
+    #(t, lean, ax, ay, brake) samples into the lean/brake trails (every sample, as percent of full scale)
+    #and the sampler (G dot trail)
+    for t, lean, ax, ay, brake in samples:
+        add_sample(lean_history, min(100, (abs(lean) / TRAIL_LEAN_RANGE) * 100), t)
+        add_sample(brake_history, min(100, (brake / TRAIL_BRAKE_RANGE) * 100), t)
+        sampler.imu(t, ax, ay)
+
+class ButtonReader(threading.Thread):
+    """
+    Background reader for the button Arduino.
+    Every state change is timestamped with the Arduino's millis() when the firmware sends it (or as it arrives),
+    debounced, and turned into press events posted to self.events as (kind, button):
+    kind is "short" (on release), "long" (once, when held for BTN_LONG) or "repeat" (while still held after that),
+    button is 1 (black) or 2 (red).
+    Press lengths and debounce are measured on that one clock, never across the serial lag. The long press
+    deadline runs from when the press line arrived, which is never before the real press.
+    main() drains the queue every frame, so button timing doesn't depend on how long a frame takes to draw.
+    """
+
+    def __init__(self, ser, on_lost=None):
+        super().__init__(name="ButtonReader", daemon=True)
+        self.ser = ser #None while disconnected, the connection supervisor swaps a new one in
+        self.on_lost = on_lost #called with the failed serial when it errors
+        self.events = queue.SimpleQueue()
+        self._running = threading.Event()
+        self._buf = bytearray()
+        self._state = {1: 1, 2: 1}
+        self._changed_at = {1: -1.0, 2: -1.0}
+        self._press_start = {1: None, 2: None}
+        self._next_repeat = {1: None, 2: None} #when the next long/repeat event is due while held
+        self._long_fired = {1: False, 2: False}
+
+    def run(self):
+        self._running.set()
+        while self._running.is_set():
+            ser = self.ser
+            if ser is None: #waiting on a reconnect
+                time.sleep(0.05)
+                self._check_held(time.monotonic())
+                continue
+            try:
+                #blocks up to the serial timeout for the first byte, then takes whatever else is there
+                data = ser.read(max(1, ser.in_waiting))
+            except (serial.SerialException, OSError) as e:
+                print(f"[SERIAL-BTN ERROR] {e}")
+                if self.on_lost:
+                    self.on_lost(ser)
+                else:
+                    break
+                continue
+            now = time.monotonic()
+            if data:
+                self._buf += data
+                while True:
+                    end = self._buf.find(b"\n")
+                    if end < 0:
+                        break
+                    line = bytes(self._buf[:end])
+                    del self._buf[:end + 1]
+                    self._handle_line(line, now)
+            self._check_held(now)
+
+    def stop(self):
+        self._running.clear()
+
+    def set_serial(self, ser):
+        #new handle from the supervisor - forget the half line from the old one and release anything held
+        self._buf = bytearray()
+        if ser is None:
+            now = time.monotonic()
+            for button in (1, 2):
+                if self._state[button] == 0:
+                    self._state[button] = 1
+                    self._press_start[button] = None #a press cut off by a disconnect doesn't count
+                    self._transition(button, 1, now, now)
+        self.ser = ser
+
+    def _handle_line(self, line, now):
+        #"b1,b2" or "b1,b2,millis" from Dash_btns, 0 = pressed
+        values = line.decode("ascii", errors="ignore").replace("(", "").replace(")", "").strip().split(",")
+        try:
+            states = {1: int(values[0]), 2: int(values[1])}
+        except (ValueError, IndexError):
+            return
+        t = now #press timing clock: arduino millis if sent, otherwise host arrival time
+        if len(values) > 2:
+            try:
+                t = int(values[2]) / 1000.0
+            except ValueError:
+                pass
+
+        for button, new_state in states.items():
+            if new_state == self._state[button]:
+                continue
+            if 0 <= t - self._changed_at[button] < BTN_DEBOUNCE: #bounce (negative = the Arduino reset, not a bounce)
+                continue
+            self._changed_at[button] = t
+            self._state[button] = new_state
+            self._transition(button, new_state, t, now)
+
+    def _transition(self, button, new_state, t, now):
+        #t = when it happened on the press timing clock, now = host monotonic arrival time
+        telemetry.publish({"btn1" if button == 1 else "btn2": new_state})
+
+        if new_state == 0: #just pressed
+            self._press_start[button] = t
+            self._next_repeat[button] = now + BTN_LONG
+            self._long_fired[button] = False
+        else: #just released
+            start = self._press_start[button]
+            self._press_start[button] = None
+            self._next_repeat[button] = None
+            if start is None or t < start:
+                return
+            if BTN_SHORT <= t - start < BTN_LONG:
+                self.events.put(("short", button))
+            elif t - start >= BTN_LONG and not self._long_fired[button]:
+                self.events.put(("long", button)) #held long enough, the release just got here before the deadline
+
+    def _check_held(self, now):
+        for button in (1, 2):
+            due = self._next_repeat[button]
+            if due is None or now < due:
+                continue
+            self.events.put(("repeat" if self._long_fired[button] else "long", button))
+            self._long_fired[button] = True
+            self._next_repeat[button] = due + BTN_REPEAT_INTERVAL
+
+
+def read_button_events(reader):
+    #Everything the button thread posted since last frame
+    events = []
+    if reader is None:
+        return events
+    while True:
+        try:
+            events.append(reader.events.get_nowait())
+        except queue.Empty:
+            return events
+
+
+def reset_peaks():
+    telemetry.publish({"maxg": 0, "maxl": 0, "maxr": 0, "maxbrake": 0})
 
-    if not latest_line:
+def discover_serial_ports(timeout=SERIAL_PROBE_BOOT, quiet=False):
+    """
+    Fills in SERIAL_PORT1/SERIAL_PORT2 that are set to "AUTO" by probing every USB serial port at once.
+    Ports already in use are left alone. Whatever isn't found stays "AUTO" and is looked for again by
+    auto_port_available(). In FAKE mode the fake data generator takes the IMU's place.
+    """
+    global SERIAL_PORT1, SERIAL_PORT2, serArdString, serBtnString
+    if SERIAL_PORT1 != "AUTO" and SERIAL_PORT2 != "AUTO":
         return
+    taken = {os.path.realpath(port) for port in (SERIAL_PORT1, SERIAL_PORT2) if port != "AUTO"}
+    ports = [port for port in SerialTest.candidate_ports() if os.path.realpath(port) not in taken]
+    found = SerialTest.discover_ports(ports, timeout=timeout)
+    if SERIAL_PORT1 == "AUTO":
+        #the fake generator in binary mode looks just like the IMU
+        imu_port = (found.get("fake") or found.get("imu")) if INPUT_MODE == "FAKE" else found.get("imu")
+        if imu_port:
+            SERIAL_PORT1 = imu_port
+            print(f"[SERIAL] IMU port: {SERIAL_PORT1}")
+        elif not quiet:
+            serArdString = "[SERIAL] No IMU found, still looking"
+            print(serArdString)
+    if SERIAL_PORT2 == "AUTO":
+        btn_port = found.get("btn")
+        if btn_port:
+            SERIAL_PORT2 = btn_port
+            print(f"[SERIAL-BTN] Button port: {SERIAL_PORT2}")
+        elif not quiet:
+            serBtnString = "[SERIAL-BTN] No buttons found, still looking"
+            print(serBtnString)
 
-    #Only parse the four keys we care about
-    parts = latest_line.split(",")
-    for p in parts:  #this loop checks for "keys" from incoming CSV, key must match for data to be collected
-        if ":" not in p:
-            continue
-        key, value = p.split(":", 1)
-        try:
-            value = float(value)
-        except:
-            continue
 
-        if key == "LEAN":
-            imu_data["lean"] = value
-        elif key == "BRK":
-            imu_data["brake"] = value
-        elif key == "AX":
-            imu_data["ax"] = value
-        elif key == "AY":
-            imu_data["ay"] = value
+# ============================================================
+#               CONNECTION SUPERVISOR
+# ============================================================
+
+CONN_RETRY_MIN = 0.5  #seconds before the first retry, doubles every failure
+CONN_RETRY_MAX = 8.0
+
+
+def port_present(port):
+    #USB serial by-path links vanish when the Arduino drops off, no point trying to open them until they're back
+    #(COM ports on windows can't be checked this way, just try them)
+    if port == "AUTO": #discovery didn't find it
+        return False
+    return os.name == "nt" or os.path.exists(port)
+
+
+_rescan = None #background serial rescan thread, see auto_port_available()
 
-def read_buttons():
+
+def auto_port_available(number):
     """
-    Reads button states from Serial 2 and updates globals:
-    btn1_state, btn2_state (0/1)
-    btn1_short_press, btn1_long_press
-    btn2_short_press, btn2_long_press
+    Supervisor availability check for SERIAL_PORT1 (number 1) / SERIAL_PORT2 (number 2).
+    A port still on "AUTO" starts a background rescan (full PROBE_TIMEOUT, so slow devices are found too) and counts as
+    not there yet - the supervisor's backoff sets how often. The rescan fills the port in for the next attempt.
     """
-    global btn1_state, btn2_state
-    global btn1_short_press, btn1_long_press, btn2_short_press, btn2_long_press
-    global _btn1_press_start, _btn2_press_start
+    global _rescan
+    port = SERIAL_PORT1 if number == 1 else SERIAL_PORT2
+    if port != "AUTO":
+        return port_present(port)
+    if _rescan is None or not _rescan.is_alive():
+        _rescan = threading.Thread(target=discover_serial_ports, args=(SerialTest.PROBE_TIMEOUT, True),
+                                   name="SerialRescan", daemon=True)
+        _rescan.start()
+    return False
 
-    if btn_serial is None or btn_serial.in_waiting == 0:
-        return
 
+def can_present():
+    if INPUT_MODE != "REAL" or not os.path.isdir("/sys/class/net"):
+        return True
+    return os.path.exists(f"/sys/class/net/{CAN_CHANNEL}")
+
+
+class ConnectionSupervisor(threading.Thread):
+    """
+    Keeps the CAN bus and both serial ports open.
+    Each source has an opener (init_can, init_serial...) that returns a handle or None.
+    When a reader reports a handle as lost it gets closed and the supervisor retries in the background with
+    backoff, then hands the new handle to the source's on_connect callback - the render loop never waits on it.
+    state is "up", "down" (lost, retrying) or "off" (not connected yet), drawn by draw_connections().
+    close_all() closes every handle on shutdown, and nothing is opened after it.
+    """
+
+    def __init__(self):
+        super().__init__(name="ConnectionSupervisor", daemon=True)
+        self.sources = {}
+        self._lock = threading.Lock()
+        self._running = threading.Event()
+        self._closed = False
+
+    def add(self, name, opener, available=None, on_connect=None):
+        self.sources[name] = {
+            "open": opener, "available": available, "on_connect": on_connect,
+            "handle": None, "state": "off", "reconnects": 0,
+            "retry_at": 0.0, "backoff": CONN_RETRY_MIN,
+        }
+
+    def connect_all(self):
+        #First attempt for every source, all at once so it takes as long as the slowest one
+        threads = [threading.Thread(target=self._attempt, args=(name,), name=f"Connect-{name}", daemon=True)
+                   for name in self.sources]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def handle(self, name):
+        src = self.sources.get(name)
+        return src["handle"] if src else None
+
+    def status(self):
+        #[(name, state, reconnects)] for the connections box
+        return [(name, src["state"], src["reconnects"]) for name, src in self.sources.items()]
+
+    def lost(self, name, handle):
+        #Called from any thread when a handle errors, ignored if it was already replaced
+        with self._lock:
+            src = self.sources[name]
+            if handle is None or src["handle"] is not handle:
+                return
+            src["handle"] = None
+            src["state"] = "down"
+            src["retry_at"] = time.monotonic() + CONN_RETRY_MIN
+            src["backoff"] = CONN_RETRY_MIN
+        print(f"[CONN] {name} lost, reconnecting in the background")
+        if src["on_connect"]:
+            src["on_connect"](None)
+        close_handle(handle)
+
+    def close_all(self):
+        #Shutdown - close every open handle, stops late attempts from opening new ones
+        with self._lock:
+            self._closed = True
+            handles = [(name, src["handle"]) for name, src in self.sources.items() if src["handle"] is not None]
+            for name, _ in handles:
+                self.sources[name]["handle"] = None
+                self.sources[name]["state"] = "off"
+        for name, handle in handles:
+            if self.sources[name]["on_connect"]:
+                self.sources[name]["on_connect"](None)
+            close_handle(handle)
+
+    def _attempt(self, name):
+        src = self.sources[name]
+        now = time.monotonic()
+        handle = None
+        if src["available"] is None or src["available"]():
+            handle = src["open"]()
+        with self._lock:
+            if handle is not None and self._closed: #opened while shutting down
+                close_handle(handle)
+                return
+            if handle is None:
+                src["retry_at"] = now + src["backoff"]
+                src["backoff"] = min(src["backoff"] * 2, CONN_RETRY_MAX)
+                return
+            if src["state"] == "down":
+                src["reconnects"] += 1
+            src["handle"] = handle
+            src["state"] = "up"
+            src["backoff"] = CONN_RETRY_MIN
+        if src["reconnects"]:
+            print(f"[CONN] {name} reconnected (#{src['reconnects']})")
+        if src["on_connect"]:
+            src["on_connect"](handle)
+
+    def run(self):
+        self._running.set()
+        while self._running.is_set():
+            now = time.monotonic()
+            for name, src in self.sources.items():
+                if src["handle"] is None and now >= src["retry_at"]:
+                    self._attempt(name)
+            time.sleep(0.1)
+
+    def stop(self):
+        self._running.clear()
+
+
+connections = None #ConnectionSupervisor, set up in main()
+
+
+def close_handle(handle):
+    #CAN buses shut down, serial ports close
     try:
-        line = btn_serial.readline().decode('utf-8').strip()
-        line = line.replace('(', '').replace(')', '')
-        values = line.split(',')
-        btn1_new = int(values[0])
-        btn2_new = int(values[1])
-    except (ValueError, IndexError):
-        return
+        if hasattr(handle, "shutdown"):
+            handle.shutdown()
+        else:
+            handle.close()
+    except Exception:
+        pass
+
+
+def setup_sources():
+    """
+    Creates the connection supervisor with the CAN bus and both serial ports as sources, and the CAN and
+    button reader threads they feed. Nothing is connected or started yet. Returns (can_reader, btn_reader),
+    can_reader is None in FAKE mode.
+    """
+    global connections
+    connections = ConnectionSupervisor()
+    can_reader = None
+    if INPUT_MODE in ("REAL", "REPLAY"):
+        can_logger = CanLog.CanRingLogger(CAN_LOG_FILE, CAN_LOG_RECORDS).start() if CAN_LOG_FILE else None
+        #decodes in the background, loop below never waits on CAN
+        can_reader = CanReader(None, logger=can_logger, on_lost=lambda bus: connections.lost("can", bus))
+        connections.add("can", init_can, available=can_present, on_connect=lambda bus: setattr(can_reader, "bus", bus))
+    else:
+        init_can() #FAKE mode, just reports CAN as disabled
+    #presses are timed in their own thread, not at frame rate
+    btn_reader = ButtonReader(None, on_lost=lambda ser: connections.lost("btn", ser))
+    connections.add("imu", init_serial, available=lambda: auto_port_available(1), on_connect=reset_imu_stream)
+    connections.add("btn", init_button_serial, available=lambda: auto_port_available(2),
+                    on_connect=btn_reader.set_serial)
+    return can_reader, btn_reader
+
+
+def poll_imu(history=True):
+    #Reads whatever the IMU sent since last time through the peaks/histories, returns the batch or None
+    ser_imu = connections.handle("imu")
+    try:
+        imu = read_serial(ser_imu)
+    except (serial.SerialException, OSError) as e:
+        print(f"[SERIAL ERROR] IMU: {e}")
+        connections.lost("imu", ser_imu)
+        return None
+    if imu:
+        consume_imu_batch(imu, history) #peaks and histories see every sample, not just one per frame
+    return imu
+
+
+def stop_sources(can_reader, btn_reader, run_time):
+    connections.stop()
+    if connections.is_alive():
+        connections.join(timeout=1) #so it isn't halfway through reopening something
+    btn_reader.stop()
+    if btn_reader.is_alive():
+        btn_reader.join(timeout=1) #a read in progress ends at the serial timeout
+    if can_reader:
+        can_reader.stop()
+        can_reader.join(timeout=1)
+        stats = can_reader.stats()
+        print("[CAN] Reader stats:", stats, f"({stats['received'] / max(run_time, 1e-9):.0f} frames/s decoded)")
+        if can_reader.logger:
+            if can_reader.is_alive(): #still stuck in a recv, closing the map under it would break log()
+                can_reader.logger.flush()
+            else:
+                can_reader.logger.stop()
+    connections.close_all() #CAN bus and both serial ports, so a restart (or the parent) can open them again
+
+
+# ============================================================
+#               ACQUISITION PROCESS
+# ============================================================
+
+#With ACQUISITION_PROCESS = True the CAN, IMU and button readers run in a separate process, so a slow frame never
+#holds up the sensors (and the other way round). It publishes into a shared memory block, main() only renders from it.
+#Block layout, every slot 8 bytes little endian:
+#    seq | TELEMETRY_FIELDS | button event counters | (state, reconnects) per source | IMU samples written
+#followed by a ring of the last SHM_IMU_RING IMU samples (t, lean, ax, ay, brake) for the trail histories.
+#t is time.monotonic(), one system-wide clock, so the renderer can put it straight into its series.
+#seq is a sequence lock: odd while the writer is in the middle of an update, the reader retries until it
+#gets the same even seq before and after its read.
+
+SHM_EVENTS = (("short", 1), ("short", 2), ("long", 1), ("long", 2), ("repeat", 1), ("repeat", 2))
+SHM_SOURCES = ("can", "imu", "btn")
+SHM_STATES = (None, "off", "up", "down") #None = not a source in this input mode
+SHM_IMU_RING = 512 #samples, seconds of IMU data at a few hundred Hz - only has to cover the longest frame
+SHM_READ_TRIES = 100 #a writer that died halfway through leaves seq odd, give up and keep the last good read
+
+
+def _telemetry_codes():
+    #struct code per field - whole number values stay ints so they draw as "88", not "88.0"
+    floats = {"lean", "ax", "ay", "brake", "maxg", "maxbrake"}
+    floats |= {sig.name for sig in CAN_SIGNALS if not (isinstance(sig.scale, int) and isinstance(sig.offset, int))}
+    return "".join("d" if name in floats else "q" for name in TELEMETRY_FIELDS)
+
+
+SHM_SEQ = struct.Struct("<Q")
+SHM_HEAD = struct.Struct("<Q" + _telemetry_codes() + "Q" * len(SHM_EVENTS) + "q" * 2 * len(SHM_SOURCES) + "Q")
+SHM_SAMPLE = struct.Struct("<5d")
+SHM_SIZE = SHM_HEAD.size + SHM_IMU_RING * SHM_SAMPLE.size
+
+
+def attach_shared_memory(name):
+    """
+    Opens an existing shared memory block without registering it with this process's resource tracker.
+    Only the creator tracks and unlinks it - a tracked attach warns about a "leaked" block or unlinks it
+    when the attaching process exits. Unregistering after the fact isn't safe either: children share the
+    creator's tracker, so that would drop the creator's own registration.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedTelemetry:
+    """
+    The telemetry block in multiprocessing.shared_memory.
+    The acquisition process creates nothing - it attaches by name (untracked) and is the only writer (write()).
+    The render process creates and unlinks the block and only reads it (read()), never taking a lock.
+    """
+
+    def __init__(self, name=None):
+        #a new block is all zeros - seq 0, nothing published yet
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=SHM_SIZE)
+        else:
+            self.shm = attach_shared_memory(name)
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+        n_fields = len(TELEMETRY_FIELDS)
+        self._events_at = 1 + n_fields
+        self._sources_at = self._events_at + len(SHM_EVENTS)
+        #writer side
+        self._seq = 0
+        self._imu_written = 0
+        #reader side
+        self.state = TelemetryState()
+        self.connections = []
+        self._events_seen = (0,) * len(SHM_EVENTS)
+        self._imu_read = 0
+        self.torn_reads = 0 #reads that had to be retried because the writer was mid-update
+        self.imu_dropped = 0 #samples the ring overwrote before the renderer got to them
+
+    def write(self, state, events, sources, samples=()):
+        """
+        One update: state is a TelemetryState, events the button event counters in SHM_EVENTS order,
+        sources [(state, reconnects)] in SHM_SOURCES order, samples new (t, lean, ax, ay, brake) IMU samples.
+        """
+        buf = self.buf
+        seq = self._seq + 1
+        SHM_SEQ.pack_into(buf, 0, seq) #odd - readers hold off
+        written = self._imu_written
+        for sample in samples:
+            SHM_SAMPLE.pack_into(buf, SHM_HEAD.size + (written % SHM_IMU_RING) * SHM_SAMPLE.size, *sample)
+            written += 1
+        self._imu_written = written
+        SHM_HEAD.pack_into(buf, 0, seq, *[getattr(state, name) for name in TELEMETRY_FIELDS], *events,
+                           *[value for source in sources for value in source], written)
+        self._seq = seq + 1
+        SHM_SEQ.pack_into(buf, 0, self._seq) #even again - published
+
+    def read(self):
+        """
+        Returns (state, events, samples) from the newest consistent update: a TelemetryState, the button events
+        [(kind, button)] and the IMU samples [(t, lean, ax, ay, brake)] since the last read.
+        If the writer never lets go of the block the last good state comes back with no events or samples.
+        """
+        buf = self.buf
+        for _ in range(SHM_READ_TRIES):
+            seq = SHM_SEQ.unpack_from(buf, 0)[0]
+            if seq & 1:
+                self.torn_reads += 1
+                continue
+            head = SHM_HEAD.unpack_from(buf, 0)
+            written = head[-1]
+            first = max(self._imu_read, written - SHM_IMU_RING)
+            samples = [SHM_SAMPLE.unpack_from(buf, SHM_HEAD.size + (i % SHM_IMU_RING) * SHM_SAMPLE.size)
+                       for i in range(first, written)]
+            if SHM_SEQ.unpack_from(buf, 0)[0] == seq:
+                break
+            self.torn_reads += 1
+        else:
+            return self.state, [], []
+
+        if seq == self.state.seq * 2:
+            return self.state, [], [] #nothing new since last frame
+
+        state = TelemetryState.__new__(TelemetryState)
+        for name, value in zip(TELEMETRY_FIELDS, head[1:]):
+            setattr(state, name, value)
+        state.seq = seq // 2
+        self.state = state
+
+        counts = head[self._events_at:self._sources_at]
+        events = []
+        for event, count, seen in zip(SHM_EVENTS, counts, self._events_seen):
+            events += [event] * (count - seen)
+        self._events_seen = counts
+
+        pairs = head[self._sources_at:-1]
+        self.connections = [(name, SHM_STATES[pairs[2 * i]], pairs[2 * i + 1])
+                            for i, name in enumerate(SHM_SOURCES) if pairs[2 * i]]
+
+        self.imu_dropped += first - self._imu_read
+        self._imu_read = written
+        return state, events, samples
+
+    def status(self):
+        #same shape as ConnectionSupervisor.status(), for draw_connections
+        return self.connections
+
+    def close(self, unlink=False):
+        self.buf = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def acquisition_main(shm_name, input_mode, boot_info, stop):
+    """
+    Entry point of the acquisition process: connects everything, then keeps reading the IMU and publishing
+    telemetry, button events and connection states into the shared block until stop is set.
+    boot_info gets the three status lines once the first connection attempt is done, for the splash.
+    The black/red "long" press to reset the peaks is handled here, where the peaks are tracked.
+    """
+    global INPUT_MODE
+    INPUT_MODE = input_mode
+    shared = SharedTelemetry(shm_name)
+    can_reader, btn_reader = setup_sources()
+    if can_reader:
+        can_reader.start()
+    btn_reader.start()
+    discover_serial_ports()
+    connections.connect_all()
+    boot_info.put((canString, serArdString, serBtnString))
+    connections.start()
+
+    events = [0] * len(SHM_EVENTS)
+    start = time.perf_counter()
+    last = None
+    try:
+        while not stop.is_set():
+            imu = poll_imu(history=False)
+            samples = list(zip(imu.t, imu.lean, imu.ax, imu.ay, imu.brake)) if imu else ()
+            for event in read_button_events(btn_reader):
+                if event == ("long", 2):
+                    reset_peaks()
+                events[SHM_EVENTS.index(event)] += 1
+            status = {name: (state, reconnects) for name, state, reconnects in connections.status()}
+            sources = [(SHM_STATES.index(status[name][0]), status[name][1]) if name in status else (0, 0)
+                       for name in SHM_SOURCES]
+            snapshot = (telemetry.front.seq, tuple(events), tuple(sources))
+            if samples or snapshot != last:
+                shared.write(telemetry.front, events, sources, samples)
+                last = snapshot
+            time.sleep(ACQ_POLL)
+    except KeyboardInterrupt: #ctrl+c reaches both processes, the render process does the stopping
+        pass
+    stop_sources(can_reader, btn_reader, time.perf_counter() - start)
+    shared.close()
+
+
+def start_acquisition():
+    """
+    Creates the shared block and starts the acquisition process.
+    Returns (shared, process, stop, boot_info) - stop is the Event that ends the process.
+    """
+    shared = SharedTelemetry()
+    boot_info = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    process = multiprocessing.Process(target=acquisition_main, name="PyDashAcquisition",
+                                      args=(shared.name, INPUT_MODE, boot_info, stop), daemon=True)
+    process.start()
+    return shared, process, stop, boot_info
+
+
+def wait_for_acquisition(boot_info):
+    #Splash stand-in for connect_devices in process mode, picks up the status lines from the acquisition process
+    global canString, serArdString, serBtnString
+    try:
+        canString, serArdString, serBtnString = boot_info.get(timeout=SPLASH_MAX)
+    except queue.Empty:
+        pass
 
-    # --- Button 1 logic --- black btn
-    if btn1_new == 0 and btn1_state == 1:  # just pressed
-        _btn1_press_start = time.time()
-    elif btn1_new == 1 and btn1_state == 0:  # just released
-        duration = time.time() - (_btn1_press_start or time.time())
-        btn1_short_press = 0.1 <= duration < 3
-        btn1_long_press = duration >= 3
-        _btn1_press_start = None
-
-    # --- Button 2 logic --- red btn
-    if btn2_new == 0 and btn2_state == 1:  # just pressed
-        _btn2_press_start = time.time()
-    elif btn2_new == 1 and btn2_state == 0:  # just released
-        duration = time.time() - (_btn2_press_start or time.time())
-        btn2_short_press = 0.1 <= duration < 3
-        btn2_long_press = duration >= 3
-        _btn2_press_start = None
-
-    # Update states
-    btn1_state = btn1_new
-    btn2_state = btn2_new
 
 # ============================================================
 #               PYGAME INITIALIZATION
 # ============================================================
 
-pygame.init()
-screen = pygame.display.set_mode((800, 480))
-pygame.display.set_caption("PyDash V.2.1  (4 Screens)")
-clock = pygame.time.Clock()
-
-font_big = pygame.font.SysFont("Arial", 120)
-font_small = pygame.font.SysFont("Arial", 60)
-font_1_1 = pygame.font.SysFont("Arial", 10)
-font_1_2 = pygame.font.SysFont("Arial", 22)
-font_1_3 = pygame.font.SysFont("Arial", 25)
-font_1_4 = pygame.font.SysFont("Arial", 40)
-font_1_5 = pygame.font.SysFont("Arial", 50)
-font_1 = pygame.font.SysFont("Arial", 60)
-font_2 = pygame.font.SysFont("Arial", 80)
-font_3 = pygame.font.SysFont("Arial", 90)
-font_4 = pygame.font.SysFont("Arial", 100)
-font_5 = pygame.font.SysFont("Arial", 120)
-font_6 = pygame.font.SysFont("Arial", 130)
-font_7 = pygame.font.SysFont("Arial", 140)
-font_8 = pygame.font.SysFont("Arial", 150)
-font_9 = pygame.font.SysFont("Arial", 160)
-font_10 = pygame.font.SysFont("Arial", 170)
-font_11 = pygame.font.SysFont("Arial", 180)
-font_12 = pygame.font.SysFont("Arial", 220)
+screen = None #display surface, set up by init_display()
+clock = None
+bg_main = None
+
+
+def init_display():
+    #Only the pygame modules the dash uses, pygame.init() would also bring up audio, joysticks...
+    global screen, clock, bg_main
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((800, 480))
+    pygame.display.set_caption("PyDash V.2.1  (4 Screens)")
+    clock = pygame.time.Clock()
+    bg_main = load_bg(BG_IMAGE)
+
+
+_font_files = {} #(name, bold) -> font file, None = pygame's built in font
+
+
+def font_file(name, bold=False):
+    #One system font lookup per name - SysFont rescans the font list for every size
+    key = (name, bold)
+    if key not in _font_files:
+        if name == FONT_NAME and FONT_FILE and not bold:
+            _font_files[key] = FONT_FILE
+        else:
+            _font_files[key] = pygame.font.match_font(name, bold=bold)
+    return _font_files[key]
+
+
+class LazyFont:
+    """
+    Stands in for a pygame Font of one size. The file is opened the first time the font is used,
+    after that its methods are cached on the proxy so calls go straight to the real Font.
+    """
+
+    def __init__(self, size, name=FONT_NAME, bold=False):
+        self.point_size = size
+        self.name = name
+        self.bold_style = bold
+
+    def load(self):
+        font = self.__dict__.get("_font")
+        if font is None:
+            path = font_file(self.name, self.bold_style)
+            font = pygame.font.Font(path, self.point_size)
+            if self.bold_style and path is None:
+                font.set_bold(True) #no bold file, let freetype embolden like SysFont does
+            self._font = font
+        return font
+
+    def __getattr__(self, attr):
+        #only reached for what the proxy doesn't have yet
+        value = getattr(self.load(), attr)
+        setattr(self, attr, value)
+        return value
+
+
+font_big = LazyFont(120)
+font_small = LazyFont(60)
+font_1_1 = LazyFont(10)
+font_1_2 = LazyFont(22)
+font_1_3 = LazyFont(25)
+font_1_4 = LazyFont(40)
+font_1_5 = LazyFont(50)
+font_1 = LazyFont(60)
+font_2 = LazyFont(80)
+font_3 = LazyFont(90)
+font_4 = LazyFont(100)
+font_5 = LazyFont(120)
+font_6 = LazyFont(130)
+font_7 = LazyFont(140)
+font_8 = LazyFont(150)
+font_9 = LazyFont(160)
+font_10 = LazyFont(170)
+font_11 = LazyFont(180)
+font_12 = LazyFont(220)
+
+
+# ============================================================
+#               BOOT TIMING
+# ============================================================
+
+boot_marks = [] #(phase, seconds) in the order they finished
+
+
+def boot_mark(phase, since):
+    #Records a phase that started at since, returns now for the next one
+    now = time.perf_counter()
+    boot_marks.append((phase, now - since))
+    return now
+
+
+def print_boot_times():
+    total = time.perf_counter() - BOOT_T0
+    phases = "  ".join(f"{phase} {secs:.2f}s" for phase, secs in boot_marks)
+    print(f"[BOOT] {phases}  ready after {total:.2f}s")
+    if total > BOOT_BUDGET:
+        print(f"[BOOT] over the {BOOT_BUDGET:.1f}s budget")
+
+
+def connect_devices():
+    #Runs behind the splash: port discovery, then the first connection attempt for every source at once.
+    #Anything not there yet is left to the supervisor, which starts right after.
+    start = time.perf_counter()
+    discover_serial_ports()
+    connections.connect_all()
+    boot_mark("devices", start)
+    connections.start()
 
 
 # ============================================================
@@ -332,90 +1605,107 @@ def load_bg(path):
         print(f"[WARNING] Missing {path}")
         return None
 
-bg_main = load_bg(BG_IMAGE)
-
 
 # ============================================================
 #               SPLASH SCREEN (for booting)
 # ============================================================
 
-def show_splash():
-    try:
-        img = pygame.image.load(BG_IMAGE)
-        img = pygame.transform.scale(img, (800, 480))
-        screen.blit(img, (0, 0))
-        pygame.display.update()
-        splash_animation(screen, char_delay=2)
-        time.sleep(2)
-
-    except:
-        print("[SPLASH] Missing image.")
-
-
-import pygame
-
-
-def splash_animation(screen, char_delay=4, x_offset=10, y_offset=50):
-    global canString, serArdString, serBtnString
+SPLASH_DRAW_TIME = 1.5 #seconds for the logo to type itself out
+SPLASH_HOLD = 1.0 #seconds the device status stays up
+SPLASH_MAX = 5.0 #start the dash after this even if devices are still connecting
+
+# ASCII logo embedded
+SPLASH_ART = [
+    "$$$$$$$\\            $$$$$$$\\   $$$$$$\\   $$$$$$\\  $$\\   $$\\       $$\\    $$\\    $$\\",
+    "$$  __$$\\           $$  __$$\\ $$  __$$\\ $$  __$$\\ $$ |  $$ |      $$ |   $$ | $$$$ |",
+    "$$ |  $$ |$$\\   $$\\ $$ |  $$ |$$ /  $$ |$$ /  \\__|$$ |  $$ |      $$ |   $$ | \\_$$ |",
+    "$$$$$$$  |$$ |  $$ |$$ |  $$ |$$$$$$$$ |\\$$$$$$\\  $$$$$$$$ |      \\$$\\  $$  |   $$ |",
+    "$$  ____/ $$ |  $$ |$$ |  $$ |$$  __$$ | \\____$$\\ $$  __$$ |       \\$$\\$$  /    $$ |",
+    "$$ |      $$ |  $$ |$$ |  $$ |$$ |  $$ |$$\\   $$ |$$ |  $$ |        \\$$$  /     $$ |",
+    "$$ |      \\$$$$$$$ |$$$$$$$  |$$ |  $$ |\\$$$$$$  |$$ |  $$ |         \\$  /$$\\ $$$$$$\\",
+    "\\__|       \\____$$ |\\_______/ \\__|  \\__| \\______/ \\__|  \\__|          \\_/ \\__|\\______|",
+    "          $$\\   $$ |",
+    "          \\$$$$$$  |",
+    "           \\______/"
+]
+
+
+def render_splash_logo(font_size=15):
     """
-    Draws an ASCII logo scrolling left-to-right, top-to-bottom with optional offsets.
-
-    :param screen: Pygame screen object
-    :param char_delay: Delay in milliseconds between characters
-    :param x_offset: Horizontal pixel offset for the logo
-    :param y_offset: Vertical pixel offset for the logo
+    The ASCII logo rendered once onto a transparent surface, one character cell every
+    font_size * 0.6 px. Returns (surface, cell width).
     """
-    pygame.font.init()
-    font_color = (255, 255, 255)
-    font_size =15
-    font = pygame.font.SysFont("Consolas", font_size, bold=True)
-
-    # ASCII logo embedded
-    ascii_art = [
-        "$$$$$$$\\            $$$$$$$\\   $$$$$$\\   $$$$$$\\  $$\\   $$\\       $$\\    $$\\    $$\\",
-        "$$  __$$\\           $$  __$$\\ $$  __$$\\ $$  __$$\\ $$ |  $$ |      $$ |   $$ | $$$$ |",
-        "$$ |  $$ |$$\\   $$\\ $$ |  $$ |$$ /  $$ |$$ /  \\__|$$ |  $$ |      $$ |   $$ | \\_$$ |",
-        "$$$$$$$  |$$ |  $$ |$$ |  $$ |$$$$$$$$ |\\$$$$$$\\  $$$$$$$$ |      \\$$\\  $$  |   $$ |",
-        "$$  ____/ $$ |  $$ |$$ |  $$ |$$  __$$ | \\____$$\\ $$  __$$ |       \\$$\\$$  /    $$ |",
-        "$$ |      $$ |  $$ |$$ |  $$ |$$ |  $$ |$$\\   $$ |$$ |  $$ |        \\$$$  /     $$ |",
-        "$$ |      \\$$$$$$$ |$$$$$$$  |$$ |  $$ |\\$$$$$$  |$$ |  $$ |         \\$  /$$\\ $$$$$$\\",
-        "\\__|       \\____$$ |\\_______/ \\__|  \\__| \\______/ \\__|  \\__|          \\_/ \\__|\\______|",
-        "          $$\\   $$ |",
-        "          \\$$$$$$  |",
-        "           \\______/"
-    ]
-
-    rows = len(ascii_art)
-
-    # Draw characters left-to-right, top-to-bottom
-    for r in range(rows):
-        for c in range(len(ascii_art[r])):
-            ch = ascii_art[r][c]
-            surface = font.render(ch, True, font_color)
-            # apply offsets here
-            screen.blit(surface, (x_offset + c * font_size * 0.6, y_offset + r * font_size))
-            pygame.display.update()
-            pygame.time.delay(char_delay)
-
-            # Handle quit events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
+    font = LazyFont(font_size, "Consolas", bold=True)
+    cell = font_size * 0.6
+    width = int(max(len(row) for row in SPLASH_ART) * cell) + font_size
+    logo = pygame.Surface((width, len(SPLASH_ART) * font_size + font_size), pygame.SRCALPHA)
+    for r, row in enumerate(SPLASH_ART):
+        for c, ch in enumerate(row):
+            if ch != " ":
+                logo.blit(text_cache.render(font, ch, (255, 255, 255)), (c * cell, r * font_size))
+    return logo, cell
+
+
+def splash_events():
+    # Handle quit events
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            exit()
+
+
+def show_splash(devices=None, x_offset=10, y_offset=50, font_size=15):
+    """
+    Types the logo out left-to-right, top-to-bottom in SPLASH_DRAW_TIME while the devices connect
+    in the background (the devices thread), building the screens' static layers between frames.
+    Returns once the logo is done and the devices are ready, or after SPLASH_MAX at the latest.
+    """
+    start = time.monotonic()
+    if bg_main:
+        screen.blit(bg_main, (0, 0))
+    else:
+        screen.fill((0, 0, 0))
+    backdrop = screen.copy()
+    pygame.display.update()
+    logo, cell = render_splash_logo(font_size)
+    total = sum(len(row) for row in SPLASH_ART)
+    pending = list(STATIC_SCREENS)
+
+    while True:
+        splash_events()
+        elapsed = time.monotonic() - start
+        shown = min(total, int(total * elapsed / SPLASH_DRAW_TIME))
+
+        # rows already finished plus the part of the current one
+        screen.blit(backdrop, (0, 0))
+        left = shown
+        for r, row in enumerate(SPLASH_ART):
+            cols = min(len(row), left)
+            if cols <= 0:
+                break
+            screen.blit(logo, (x_offset, y_offset + r * font_size), (0, r * font_size, cols * cell, font_size))
+            left -= len(row)
+        pygame.display.update()
+
+        if pending: #one static layer per frame while we're waiting anyway
+            get_static_layer(pending.pop(0))
+        ready = devices is None or not devices.is_alive()
+        if (shown == total and ready) or elapsed >= SPLASH_MAX:
+            break
+        clock.tick(FPS)
 
     # setup data
-    # Can
-    screen.blit(font_1_3.render(f"{canString}", True, (255, 255, 255)), (50, 300))
+    y = 300
+    for line in (canString, serArdString, serBtnString):
+        screen.blit(font_1_3.render(f"{line}", True, (255, 255, 255)), (50, y))
+        y += 50
+    if devices is not None and devices.is_alive():
+        screen.blit(font_1_3.render("Still connecting, carrying on in the background", True, (255, 150, 0)), (50, y))
     pygame.display.update()
-    pygame.time.delay(300)
-    # Serial
-    screen.blit(font_1_3.render(f"{serArdString}", True, (255, 255, 255)), (50, 350))
-    pygame.display.update()
-    pygame.time.delay(300)
-    # Serial-BTN
-    screen.blit(font_1_3.render(f"{serBtnString}", True, (255, 255, 255)), (50, 400))
-    pygame.display.update()
-    pygame.time.delay(3000)
+    hold_end = time.monotonic() + SPLASH_HOLD
+    while time.monotonic() < hold_end:
+        splash_events()
+        clock.tick(FPS)
 
 
 # ============================================================
@@ -423,100 +1713,353 @@ def splash_animation(screen, char_delay=4, x_offset=10, y_offset=50):
 # ============================================================
 
 #5 Screens in order: Main, laptimer, Lean, GForces, Trail
+#Each screen is its static layer (see STATIC LAYERS) plus the live values drawn on top
+#live is the TelemetryState the frame was started with, every widget reads that same snapshot
 
 #Main Screen
-def screen_1():
-    if bg_main:
-        screen.blit(bg_main, (0, 0))
-    else:
-        screen.fill((0, 0, 0))
+def screen_1(live):
+    begin_screen(1)
 
     #Load in base layout
-    draw_base_layout()
+    draw_base_layout(live)
+
+    #Speed function
+    draw_speed(screen,live.speed,x_right=530, y=125)
 
+def static_screen_1(surface):
     #Main Title
-    pygame.draw.rect(screen, (0,0,0), (710, 126, 90, 50))
-    pygame.draw.rect(screen, (255, 255, 255), (710, 126, 90, 50), 2)
-    screen.blit(font_1_4.render(f"Main", True, (255, 255, 255)), (719, 128))
+    pygame.draw.rect(surface, (0,0,0), (710, 126, 90, 50))
+    pygame.draw.rect(surface, (255, 255, 255), (710, 126, 90, 50), 2)
+    surface.blit(font_1_4.render(f"Main", True, (255, 255, 255)), (719, 128))
 
-    #Speed function
-    draw_speed(screen,speed,x_right=530, y=125)
+    draw_speed_static(surface)
 
 #==============================================================================================================
 #Laptimer Screen
-def screen_2():
-    if bg_main:
-        screen.blit(bg_main, (0, 0))
-    else:
-        screen.fill((0, 0, 0))
+def screen_2(live):
+    begin_screen(2)
 
     #Load in base layout
-    draw_base_layout()
-
-    #Laptimer title
-    pygame.draw.rect(screen, (0, 0, 0), (655, 126, 145, 50))
-    pygame.draw.rect(screen, (255, 255, 255), (655, 126, 145, 50), 2)
-    screen.blit(font_1_4.render(f"Laptimer", True, (255, 255, 255)), (665, 128))
+    draw_base_layout(live)
 
     #Laptimer function
     draw_laptimer()
 
+def static_screen_2(surface):
+    #Laptimer title
+    pygame.draw.rect(surface, (0, 0, 0), (655, 126, 145, 50))
+    pygame.draw.rect(surface, (255, 255, 255), (655, 126, 145, 50), 2)
+    surface.blit(font_1_4.render(f"Laptimer", True, (255, 255, 255)), (665, 128))
+
+    draw_laptimer_static(surface)
+
 #==============================================================================================================
 #Lean Screen
-def screen_3():
-    if bg_main:
-        screen.blit(bg_main, (0, 0))
-    else:
-        screen.fill((0, 0, 0))
+def screen_3(live):
+    begin_screen(3)
 
     #Load in base layout
-    draw_base_layout()
+    draw_base_layout(live)
+
+    #lean function
+    draw_lean(live)
 
+def static_screen_3(surface):
     #Lean title
-    pygame.draw.rect(screen, (0, 0, 0), (710, 126, 90, 50))
-    pygame.draw.rect(screen, (255, 255, 255), (710, 126, 90, 50), 2)
-    screen.blit(font_1_4.render(f"Lean", True, (255, 255, 255)), (719, 128))
+    pygame.draw.rect(surface, (0, 0, 0), (710, 126, 90, 50))
+    pygame.draw.rect(surface, (255, 255, 255), (710, 126, 90, 50), 2)
+    surface.blit(font_1_4.render(f"Lean", True, (255, 255, 255)), (719, 128))
 
-    #lean function
-    draw_lean()
+    draw_lean_static(surface)
 
 #==============================================================================================================
 #GForce Screen
-def screen_4():
-    if bg_main:
-        screen.blit(bg_main, (0, 0))
-    else:
-        screen.fill((0, 0, 0))
+def screen_4(live):
+    begin_screen(4)
 
     #Load in base layout
-    draw_base_layout()
+    draw_base_layout(live)
+
+    #gforce function
+    draw_gforce(live)
 
+def static_screen_4(surface):
     #GForce Title
-    pygame.draw.rect(screen, (0, 0, 0), (665, 126, 135, 50))
-    pygame.draw.rect(screen, (255, 255, 255), (665, 126, 135, 50), 2)
-    screen.blit(font_1_4.render(f"G-Force", True, (255, 255, 255)), (673, 128))
+    pygame.draw.rect(surface, (0, 0, 0), (665, 126, 135, 50))
+    pygame.draw.rect(surface, (255, 255, 255), (665, 126, 135, 50), 2)
+    surface.blit(font_1_4.render(f"G-Force", True, (255, 255, 255)), (673, 128))
 
-    #gforce function
-    draw_gforce()
+    draw_gforce_static(surface)
 
 #==============================================================================================================
 #Trail Screen
-def screen_5():
-    if bg_main:
-        screen.blit(bg_main, (0, 0))
-    else:
-        screen.fill((0, 0, 0))
+def screen_5(live):
+    begin_screen(5)
 
     #Load in base layout
-    draw_base_layout()
+    draw_base_layout(live)
 
+    #trail function
+    draw_trail(live)
+
+def static_screen_5(surface):
     #Trail title
-    pygame.draw.rect(screen, (0, 0, 0), (723, 126, 77, 50))
-    pygame.draw.rect(screen, (255, 255, 255), (723, 126, 77, 50), 2)
-    screen.blit(font_1_4.render(f"Trail", True, (255, 255, 255)), (730, 128))
+    pygame.draw.rect(surface, (0, 0, 0), (723, 126, 77, 50))
+    pygame.draw.rect(surface, (255, 255, 255), (723, 126, 77, 50), 2)
+    surface.blit(font_1_4.render(f"Trail", True, (255, 255, 255)), (730, 128))
 
-    #trail function
-    draw_trail()
+    draw_trail_static(surface)
+
+
+STATIC_SCREENS = {1: static_screen_1, 2: static_screen_2, 3: static_screen_3, 4: static_screen_4, 5: static_screen_5}
+
+
+# ============================================================
+#               STATIC LAYERS
+# ============================================================
+
+#Everything that never changes on a screen (background, boxes, outlines, ticks, fixed labels) is drawn once
+#into a full screen surface, so a frame is one blit plus the live values.
+#Anything that changes what gets drawn here (background, graph_duration...) must call invalidate_static_layers().
+
+static_layers = {} #screen number -> Surface
+rpm_overlay = None #RPM bar outline + ticks, they sit on top of the bar fill
+RPM_OVERLAY_KEY = (255, 0, 255) #transparent colour of the overlay
+
+
+def get_static_layer(n):
+    layer = static_layers.get(n)
+    if layer is None:
+        layer = pygame.Surface(screen.get_size()).convert()
+        if bg_main:
+            layer.blit(bg_main, (0, 0))
+        else:
+            layer.fill((0, 0, 0))
+        draw_base_static(layer)
+        STATIC_SCREENS[n](layer)
+        static_layers[n] = layer
+    return layer
+
+
+def build_static_layers():
+    #Done at boot so switching to a screen the first time doesn't cost a frame
+    for n in STATIC_SCREENS:
+        get_static_layer(n)
+    get_rpm_overlay()
+
+
+def invalidate_static_layers():
+    global rpm_overlay
+    static_layers.clear()
+    rpm_overlay = None
+    request_full_refresh()
+
+
+def get_rpm_overlay():
+    global rpm_overlay
+    if rpm_overlay is None:
+        rpm_overlay = pygame.Surface((800, 110)).convert()
+        rpm_overlay.fill(RPM_OVERLAY_KEY)
+        rpm_overlay.set_colorkey(RPM_OVERLAY_KEY, pygame.RLEACCEL)
+        pygame.draw.rect(rpm_overlay, (255, 255, 255), (0, 0, 800, 100), 4)
+        #tick marks on bar, long ones every 5k rpm
+        for x in range(50, 801, 50):
+            if x % 250 == 0:
+                pygame.draw.line(rpm_overlay, (255, 255, 255), (x, 98), (x, 60), 2)
+            else:
+                pygame.draw.line(rpm_overlay, (255, 255, 255), (x, 107), (x, 80), 2)
+    return rpm_overlay
+
+
+# ============================================================
+#               DIRTY RECTANGLES
+# ============================================================
+
+#Only the parts of the screen that changed are pushed to the display.
+#Each frame begin_screen() puts the static layer back under last frame's widgets, every widget redraws and
+#reports its area with mark_dirty(name, key, rect). The area is pushed only when key (what it shows) changed,
+#together with where the widget was last frame. A screen switch pushes the whole screen.
+
+DIRTY_ALWAYS = object() #key for widgets that change every frame (graphs, fading dots)
+
+drawn_screen = None #screen number on the display
+full_refresh = True
+widget_rects = {} #name -> rect drawn last frame
+widget_keys = {} #name -> key drawn last frame
+frame_rects = {} #name -> rect drawn this frame
+push_rects = [] #rects to push this frame
+outlined_rects = [] #debug outlines on the display, erased next frame
+dirty_stats = {"frames": 0, "full": 0, "pixels": 0}
+
+
+def request_full_refresh():
+    global full_refresh
+    full_refresh = True
+
+
+def begin_screen(n):
+    #Static layer back in place: all of it on a switch/full refresh, otherwise just under last frame's widgets
+    global drawn_screen, full_refresh
+    layer = get_static_layer(n)
+    if n != drawn_screen:
+        drawn_screen = n
+        full_refresh = True
+    if full_refresh:
+        screen.blit(layer, (0, 0))
+        return
+    for rect in widget_rects.values():
+        screen.blit(layer, rect, rect)
+    for rect in outlined_rects:
+        screen.blit(layer, rect, rect)
+
+
+def mark_dirty(name, key, rect):
+    frame_rects[name] = rect
+    if full_refresh or key is DIRTY_ALWAYS or widget_keys.get(name, DIRTY_ALWAYS) != key:
+        widget_keys[name] = key
+        push_rects.append(rect)
+        old = widget_rects.get(name)
+        if old and old != rect:
+            push_rects.append(old)
+    return rect
+
+
+def present():
+    #Pushes this frame to the display
+    global full_refresh, widget_rects, frame_rects
+    for name, old in widget_rects.items():
+        if name not in frame_rects: #widget not drawn any more, its old area was erased
+            push_rects.append(old)
+            widget_keys.pop(name, None)
+
+    rects = push_rects + outlined_rects #last frame's outlines were erased in begin_screen
+    outlined_rects.clear()
+    if DEBUG_DIRTY:
+        for rect in push_rects:
+            pygame.draw.rect(screen, (255, 0, 255), rect, 1)
+        outlined_rects.extend(push_rects)
+
+    dirty_stats["frames"] += 1
+    if full_refresh:
+        pygame.display.update()
+        dirty_stats["full"] += 1
+        dirty_stats["pixels"] += screen.get_width() * screen.get_height()
+    else:
+        pygame.display.update(rects)
+        dirty_stats["pixels"] += sum([rect.width * rect.height for rect in rects])
+
+    widget_rects = frame_rects
+    frame_rects = {}
+    push_rects.clear()
+    full_refresh = False
+
+
+def print_dirty_stats():
+    frames = dirty_stats["frames"]
+    if not frames:
+        return
+    share = dirty_stats["pixels"] / (frames * screen.get_width() * screen.get_height())
+    print(f"[DISPLAY] {frames} frames  {dirty_stats['full']} full refreshes  {share * 100:.1f}% of the screen pushed on average")
+
+
+# ============================================================
+#               TEXT CACHE
+# ============================================================
+
+#Rasterizing text at 100-220px is one of the most expensive things a frame does.
+#Labels go through text_cache (rendered once per font/text/colour), numbers are put together
+#from pre-rendered glyphs with blit_number() so a changing value never hits the rasterizer.
+
+TEXT_CACHE_SIZE = 256 #surfaces kept, least recently used dropped first
+DIGIT_CHARS = "0123456789.-: " #glyphs in every digit atlas
+
+
+class TextCache:
+    """
+    Bounded LRU of rendered text surfaces keyed by (font, text, colour).
+    """
+
+    def __init__(self, size=TEXT_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = font.render(text, True, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.size:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._surfaces),
+                "hit_rate": self.hits / total if total else 0.0}
+
+
+class DigitAtlas:
+    """
+    DIGIT_CHARS of one font and colour rendered once, numbers are drawn glyph by glyph.
+    """
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.glyphs = {ch: font.render(ch, True, color) for ch in DIGIT_CHARS}
+        self.widths = {ch: glyph.get_width() for ch, glyph in self.glyphs.items()}
+        #kerning between each pair, so a number comes out spaced exactly like font.render would do it
+        self.kerning = {a + b: font.size(a + b)[0] - self.widths[a] - self.widths[b]
+                        for a in DIGIT_CHARS for b in DIGIT_CHARS}
+        self.height = font.get_height()
+
+    def blit(self, surface, text, x, y, right=False):
+        #Returns the rect drawn. Text with characters outside the atlas goes through text_cache
+        glyphs = self.glyphs
+        widths = self.widths
+        kerning = self.kerning
+        seq = []
+        gx = 0
+        prev = ""
+        try:
+            for ch in text:
+                if prev:
+                    gx += kerning[prev + ch]
+                seq.append((glyphs[ch], gx))
+                gx += widths[ch]
+                prev = ch
+        except KeyError:
+            surf = text_cache.render(self.font, text, self.color)
+            if right:
+                x -= surf.get_width()
+            return surface.blit(surf, (x, y))
+        if right:
+            x -= gx
+        surface.blits([(glyph, (x + offset, y)) for glyph, offset in seq], False)
+        return pygame.Rect(x, y, gx, self.height)
+
+
+text_cache = TextCache()
+digit_atlases = {} #(font, colour) -> DigitAtlas
+
+
+def render_text(font, text, color):
+    return text_cache.render(font, text, color)
+
+
+def blit_number(surface, font, text, color, x, y, right=False):
+    #Draws a number from the font's digit atlas, x is the right edge when right=True
+    atlas = digit_atlases.get((font, color))
+    if atlas is None:
+        atlas = digit_atlases[(font, color)] = DigitAtlas(font, color)
+    return atlas.blit(surface, text, x, y, right)
 
 
 # ============================================================
@@ -545,32 +2088,16 @@ def draw_rpm_bar(surface, rpm, max_rpm=16000):
     elif pct < 0.8:
         color = (0, 255, 0)
     else:
-        now = time.time()
+        now = time.monotonic()
         if now - last_flash > flash_interval:
             flash_state = not flash_state
             last_flash = now
         color = (255, 0, 0) if flash_state else (120, 0, 0)
 
-    #bar rendering
+    #bar rendering, outline and ticks come from the cached overlay
     pygame.draw.rect(surface, color, (x, y, fill_width, height))
-    pygame.draw.rect(surface, (255, 255, 255), (x, y, width, height), 4)
-    #tick marks on bar
-    pygame.draw.line(screen, (255,255,255), (50,107), (50,80), 2)
-    pygame.draw.line(screen, (255,255,255), (100,107), (100,80), 2)
-    pygame.draw.line(screen, (255,255,255), (150,107), (150,80), 2)
-    pygame.draw.line(screen, (255,255,255), (200,107), (200,80), 2)
-    pygame.draw.line(screen, (255, 255, 255), (250,98), (250,60), 2)
-    pygame.draw.line(screen, (255,255,255), (300,107), (300,80), 2)
-    pygame.draw.line(screen, (255,255,255), (350, 107), (350, 80), 2)
-    pygame.draw.line(screen, (255,255,255), (400, 107), (400, 80), 2)
-    pygame.draw.line(screen, (255,255,255), (450, 107), (450, 80), 2)
-    pygame.draw.line(screen, (255, 255, 255), (500, 98), (500, 60), 2)
-    pygame.draw.line(screen, (255,255,255), (550, 107), (550, 80), 2)
-    pygame.draw.line(screen, (255,255,255), (600, 107), (600, 80), 2)
-    pygame.draw.line(screen, (255,255,255), (650, 107), (650, 80), 2)
-    pygame.draw.line(screen, (255,255, 255), (700, 107), (700, 80), 2)
-    pygame.draw.line(screen, (255, 255, 255), (750, 98), (750, 60), 2)
-    pygame.draw.line(screen, (255,255,255), (800, 107), (800, 80), 2)
+    overlay = surface.blit(get_rpm_overlay(), (x, y))
+    mark_dirty("rpm", (fill_width, color), overlay)
 
 
 # ============================================================
@@ -586,15 +2113,9 @@ def draw_coolant_temp(screen, coolant, x_right, y):
     else:
         color = (255, 150, 0)     # orange
 
-    #Generate text
-    text = font_1_5.render(f"{coolant}", True, color)
-
-    #Right alignment function
-    text_x = x_right - text.get_width()
-
-    #Render and raw on screen
-    screen.blit(text, (text_x, y))
-    screen.blit(font_1_5.render(f" C", True, (255, 255, 255)), (90, 421))
+    #Right aligned, drawn from the digit atlas
+    rect = blit_number(screen, font_1_5, f"{coolant}", color, x_right, y, right=True)
+    mark_dirty("coolant", (coolant, color), rect)
 
 
 # ============================================================
@@ -605,23 +2126,20 @@ def draw_speed(screen, speed, x_right, y):
 
     #speed is most likely imported as kph, so may need to switch to mph once i can confirm
 
-    #Draw bounding box
-    pygame.draw.rect(screen, (0, 0, 0), (200, 150, 440, 210))
-    pygame.draw.rect(screen, (255, 255, 255), (200, 150, 440, 210), 4)
-
-    #Generate text
-    text = font_12.render(f"{speed}", True, (255,255,255))
+    #Right aligned, drawn from the digit atlas
+    rect = blit_number(screen, font_12, f"{speed}", (255,255,255), x_right, y, right=True)
+    mark_dirty("speed", speed, rect)
 
-    #Right alignment function
-    text_x = x_right - text.get_width()
 
-    #Render draw Speed on screen
-    screen.blit(text, (text_x, y))
+def draw_speed_static(surface):
+    #Draw bounding box
+    pygame.draw.rect(surface, (0, 0, 0), (200, 150, 440, 210))
+    pygame.draw.rect(surface, (255, 255, 255), (200, 150, 440, 210), 4)
 
     #Vertical MPH text #MPH variable may be kph from can so may need to be converted earlier in code
-    screen.blit(font_2.render(f" M", True, (255, 255, 255)), (563, 141))
-    screen.blit(font_2.render(f" P", True, (255, 255, 255)), (563, 209))
-    screen.blit(font_2.render(f" H", True, (255, 255, 255)), (563, 276))
+    surface.blit(font_2.render(f" M", True, (255, 255, 255)), (563, 141))
+    surface.blit(font_2.render(f" P", True, (255, 255, 255)), (563, 209))
+    surface.blit(font_2.render(f" H", True, (255, 255, 255)), (563, 276))
 
 
 # ============================================================
@@ -629,107 +2147,103 @@ def draw_speed(screen, speed, x_right, y):
 # ============================================================
 
 def draw_laptimer():
+    #placeholder text -replace with function for time
+    mark_dirty("lap_current", " 00:00.000", blit_number(screen, font_4, " 00:00.000", (255, 255, 255), 220, 127))
+    mark_dirty("lap_last", " 00:00.000", blit_number(screen, font_2, " 00:00.000", (255, 255, 255), 300, 240))
+    mark_dirty("lap_best", " 00:00.000", blit_number(screen, font_2, " 00:00.000", (255, 255, 255), 300, 330))
+
+
+def draw_laptimer_static(surface):
 
     #Current Time
-    pygame.draw.rect(screen, (0, 0, 0), (160, 135, 460, 100)) #(x,y,w,h)
-    pygame.draw.rect(screen, (255, 255, 255), (160, 135, 460, 100), 2)
-    screen.blit(font_1_4.render(f"C", True, (255, 255, 255)), (165, 130))
-    screen.blit(font_1_4.render(f"U", True, (255, 255, 255)), (165, 161))
-    screen.blit(font_1_4.render(f"R", True, (255, 255, 255)), (165, 192))
-        #placeholder text -replace with function for time
-    screen.blit(font_4.render(f" 00:00.000", True, (255, 255, 255)), (220, 127))
+    pygame.draw.rect(surface, (0, 0, 0), (160, 135, 460, 100)) #(x,y,w,h)
+    pygame.draw.rect(surface, (255, 255, 255), (160, 135, 460, 100), 2)
+    surface.blit(font_1_4.render(f"C", True, (255, 255, 255)), (165, 130))
+    surface.blit(font_1_4.render(f"U", True, (255, 255, 255)), (165, 161))
+    surface.blit(font_1_4.render(f"R", True, (255, 255, 255)), (165, 192))
 
     #last Time
-    pygame.draw.rect(screen, (0, 0, 0), (220, 245, 400, 80))  # (x,y,w,h)
-    pygame.draw.rect(screen, (255, 255, 255), (220, 245, 400, 80), 2)
-    screen.blit(font_1_3.render(f"L", True, (255, 255, 255)), (227, 244))
-    screen.blit(font_1_3.render(f"A", True, (255, 255, 255)), (225, 269))
-    screen.blit(font_1_3.render(f"S", True, (255, 255, 255)), (225, 294))
-        #placeholder text -replace with function for time
-    screen.blit(font_2.render(f" 00:00.000", True, (255, 255, 255)), (300, 240))
+    pygame.draw.rect(surface, (0, 0, 0), (220, 245, 400, 80))  # (x,y,w,h)
+    pygame.draw.rect(surface, (255, 255, 255), (220, 245, 400, 80), 2)
+    surface.blit(font_1_3.render(f"L", True, (255, 255, 255)), (227, 244))
+    surface.blit(font_1_3.render(f"A", True, (255, 255, 255)), (225, 269))
+    surface.blit(font_1_3.render(f"S", True, (255, 255, 255)), (225, 294))
 
     #Best Time
-    pygame.draw.rect(screen, (0, 0, 0), (220, 335, 400, 80))  # (x,y,w,h)
-    pygame.draw.rect(screen, (255, 255, 255), (220, 335, 400, 80), 2)
-    screen.blit(font_1_3.render(f"B", True, (255, 255, 255)), (225, 336))
-    screen.blit(font_1_3.render(f"E", True, (255, 255, 255)), (225, 361))
-    screen.blit(font_1_3.render(f"S", True, (255, 255, 255)), (225, 386))
-        #placeholder text -replace with function for time
-    screen.blit(font_2.render(f" 00:00.000", True, (255, 255, 255)), (300, 330))
+    pygame.draw.rect(surface, (0, 0, 0), (220, 335, 400, 80))  # (x,y,w,h)
+    pygame.draw.rect(surface, (255, 255, 255), (220, 335, 400, 80), 2)
+    surface.blit(font_1_3.render(f"B", True, (255, 255, 255)), (225, 336))
+    surface.blit(font_1_3.render(f"E", True, (255, 255, 255)), (225, 361))
+    surface.blit(font_1_3.render(f"S", True, (255, 255, 255)), (225, 386))
 
 
 # ============================================================
 #               GFORCE FUNCTION
 # ============================================================
 
-def draw_gforce():
+def draw_gforce(live):
 
     #variables
-    long = imu_data["ay"] #y axis
-    lat = imu_data["ax"] #x axis
-    global maxg
-    #defining maxg
+    long = live.ay #y axis
+    lat = live.ax #x axis
+    maxg = live.maxg #tracked from every IMU sample in consume_imu_batch
 
-    #max function
-    absoluteg = math.sqrt(long**2 + lat**2)
-    if absoluteg > maxg:
-        maxg = round(absoluteg,3)
+        #g dot function
+    draw_g_dot()
+        #Current Values
+    label = screen.blit(render_text(font_1_4, "long=", (255, 255, 255)), (10, 300))
+    rect = blit_number(screen, font_1_4, f"{long}", (255, 255, 255), label.right, 300)
+    mark_dirty("g_long", long, label.union(rect))
+    label = screen.blit(render_text(font_1_4, "  lat=", (255, 255, 255)), (10, 340))
+    rect = blit_number(screen, font_1_4, f"{lat}", (255, 255, 255), label.right, 340)
+    mark_dirty("g_lat", lat, label.union(rect))
+        #max values -- fo rnow just a single max value for total g force, combined lat long
+    mark_dirty("maxg", maxg, blit_number(screen, font_1_4, f"{maxg}", (255, 255, 255), 600, 250))
 
 
+def draw_gforce_static(surface):
     #center graph
     cx = 375 #center x coord
     cy = 303 #center y coord
     radius = 175 #Full ouside radius
     sradius = 175 / 1.5 #scaled radius for outside being 1.5 G and 175 pixels
-    pygame.draw.circle(screen, (255, 255, 255), (cx, cy), radius +2, 8)
-    pygame.draw.circle(screen, (0, 0, 0), (cx, cy), radius-2)  # filled
-    pygame.draw.line(screen, (255,255,255), (cx - radius, cy), (cx + radius, cy), 1) #vert
-    pygame.draw.line(screen, (255,255,255), (cx, cy - radius), (cx, cy + radius), 1) #hor
+    pygame.draw.circle(surface, (255, 255, 255), (cx, cy), radius +2, 8)
+    pygame.draw.circle(surface, (0, 0, 0), (cx, cy), radius-2)  # filled
+    pygame.draw.line(surface, (255,255,255), (cx - radius, cy), (cx + radius, cy), 1) #vert
+    pygame.draw.line(surface, (255,255,255), (cx, cy - radius), (cx, cy + radius), 1) #hor
         #1g tick --- outer circle is 1.5, scale accordingly
-    pygame.draw.circle(screen, (255, 255, 255), (cx, cy), sradius, 1)
-        #g dot function
-    draw_g_dot()
+    pygame.draw.circle(surface, (255, 255, 255), (cx, cy), sradius, 1)
         #Current Values
-    pygame.draw.rect(screen, (0, 0, 0), (2, 300, 180, 90))
-    pygame.draw.rect(screen, (255, 255, 255), (2, 300, 180, 90), 2)
-    screen.blit(font_1_4.render(f"long={long}", True, (255, 255, 255)), (10, 300))
-    screen.blit(font_1_4.render(f"  lat={lat}", True, (255, 255, 255)), (10, 340))
-        #max values -- fo rnow just a single max value for total g force, combined lat long
-    pygame.draw.rect(screen, (0, 0, 0), (580, 200, 200, 130))
-    pygame.draw.rect(screen, (255, 255, 255), (580, 200, 200, 130), 2)
-    screen.blit(font_1_4.render(f"MAX - G", True, (255, 255, 255)), (600, 200))
-    screen.blit(font_1_4.render(f"{maxg}", True, (255, 255, 255)), (600, 250))
+    pygame.draw.rect(surface, (0, 0, 0), (2, 300, 180, 90))
+    pygame.draw.rect(surface, (255, 255, 255), (2, 300, 180, 90), 2)
+        #max values
+    pygame.draw.rect(surface, (0, 0, 0), (580, 200, 200, 130))
+    pygame.draw.rect(surface, (255, 255, 255), (580, 200, 200, 130), 2)
+    surface.blit(font_1_4.render(f"MAX - G", True, (255, 255, 255)), (600, 200))
 
 
 # ============================================================
 #               G DOT FUNCTION
 # ============================================================
 
-def draw_g_dot():
-    #carry over variables -MUST be same as in GFORCE FUNCTION
-    cx = 375
-    cy = 303
-    sradius = 175 / 1.5 #scaled radius, same as sradius from previosu function
-    long = imu_data["ay"]  # y axis
-    lat = imu_data["ax"]  # x axis
-    global g_history #calling global g history variable
-
-    now = time.time()
+G_TRAIL_SECONDS = 10 #how long a dot stays on the circle
+G_TRAIL_STEPS = 100 #age steps in the sprite table (0.1s each)
+G_CX = 375 #G circle center and pixels per G, same as draw_gforce_static
+G_CY = 303
+G_SCALE = 175 / 1.5
 
-    # Compute current dot position
-    x = cx + sradius * lat
-    y = cy + sradius * long
 
-    # Add the dot EVERY FRAME
-    g_history.append((now, x, y))
+#(timestamp, x, y) dot positions, a second of slack over what the sampler keeps
+g_history = series_store.add("g_dots", SAMPLE_RATE * (G_TRAIL_SECONDS + 1), ("x", "y"))
+g_dot_sprites = None #[(sprite, size)] per age step, built on first use
+g_dot_blits = [[None, [0, 0]] for _ in range(g_history.capacity)] #[sprite, [x, y]] per dot, filled in place every frame
 
-    # Keep only the last 10 seconds
-    g_history = [(t, gx, gy) for (t, gx, gy) in g_history if now - t <= 10]
 
-    # Draw the trail
-    for (t, gx, gy) in g_history:
-        age = now - t  # seconds old
-        fade = 1 - (age / 10)  # full fade over 10s (size/opacity)
+def build_g_dot_sprites():
+    sprites = []
+    for step in range(G_TRAIL_STEPS):
+        age = step * G_TRAIL_SECONDS / G_TRAIL_STEPS  # seconds old
+        fade = 1 - (age / G_TRAIL_SECONDS)  # full fade over 10s (size/opacity)
 
         #Size fade (12 → 3)
         size = max(3, int(12 * fade))
@@ -746,41 +2260,164 @@ def draw_g_dot():
         g = int(255 * color_fade)  # green disappears fast
         b = 0
 
-        #Draw with alpha on a temporary surface
-        dot_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(dot_surface, (r, g, b, alpha), (size, size), size)
-        screen.blit(dot_surface, (gx - size, gy - size))
+        sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (r, g, b, alpha), (size, size), size)
+        sprites.append((sprite, size))
+    return sprites
+
+
+def draw_g_dot():
+    #carry over variables -MUST be same as in GFORCE FUNCTION
+    cx = G_CX
+    cy = G_CY
+    global g_dot_sprites
+
+    # The last 10 seconds of G samples, the sampler adds and expires them
+    now = time.monotonic()
+
+    if g_dot_sprites is None:
+        g_dot_sprites = build_g_dot_sprites()
+
+    # One sprite per dot picked by age, oldest first so the newest ends up on top.
+    # Walks the ring's columns directly and only rewrites the preallocated blit entries - nothing new per dot
+    sprites = g_dot_sprites
+    steps = G_TRAIL_STEPS / G_TRAIL_SECONDS
+    last = G_TRAIL_STEPS - 1
+    seq = g_dot_blits
+    ts = g_history.t
+    xs, ys = g_history.columns
+    cap = g_history.capacity
+    n = len(g_history)
+    i = g_history.start
+    for k in range(n):
+        sprite, size = sprites[min(last, int(max(0.0, now - ts[i]) * steps))]
+        entry = seq[k]
+        entry[0] = sprite
+        pos = entry[1]
+        pos[0] = xs[i] - size
+        pos[1] = ys[i] - size
+        i += 1
+        if i == cap:
+            i = 0
+    seq = islice(seq, n)
+
+    # Draw the trail in one batch, kept inside the G circle so the dirty area is fixed
+    area = pygame.Rect(cx - 175, cy - 175, 350, 350)
+    screen.set_clip(area)
+    if hasattr(screen, "fblits"): #pygame 2.6+
+        screen.fblits(seq)
+    else:
+        screen.blits(seq, False)
+    screen.set_clip(None)
+    mark_dirty("g_dots", DIRTY_ALWAYS, area)
 
 
 # ============================================================
 #               LEAN FUNCTION
 # ============================================================
 
-def draw_lean():
+LEAN_CX = 400 #dial center
+LEAN_CY = 285
+LEAN_RADIUS = 150
+LEAN_LUT_STEPS = 10 #table entries per degree
+LEAN_SIN = array("d", [math.sin(math.radians(i / LEAN_LUT_STEPS)) for i in range(360 * LEAN_LUT_STEPS)])
+LEAN_COS = array("d", [math.cos(math.radians(i / LEAN_LUT_STEPS)) for i in range(360 * LEAN_LUT_STEPS)])
+lean_wedges = {} #whole degrees -> (top slice points, bottom slice points)
+
+
+def lean_wedge(deg):
+    """
+    Polygon points of the two pie slices for a lean of deg (whole degrees, + = left), built once per angle.
+    One point per degree along the rim, the bottom slice mirrors the top through the center.
+    """
+    wedge = lean_wedges.get(deg)
+    if wedge is not None:
+        return wedge
+    cx, cy, radius = LEAN_CX, LEAN_CY, LEAN_RADIUS
+    step_sign = 1 if deg >= 0 else -1
+    top = [(cx, cy)]  # center
+    bottom = [(cx, cy)]
+    for a in range(0, deg + step_sign, step_sign):
+        i = (a * LEAN_LUT_STEPS) % len(LEAN_SIN)
+        #cos(90 + a) = -sin(a), sin(90 + a) = cos(a)
+        dx = radius * LEAN_SIN[i]
+        dy = radius * LEAN_COS[i]
+        top.append((cx - dx, cy - dy))
+        bottom.append((cx + dx, cy + dy))
+    # Ensure at least 3 points
+    if len(top) < 3:
+        top += [(cx, cy - radius), (cx, cy + radius)]
+        bottom += [(cx, cy - radius), (cx, cy + radius)]
+    wedge = lean_wedges[deg] = (top, bottom)
+    return wedge
+
 
-    lean = imu_data["lean"] #grabbing lean variable from IMU arduino
+def draw_lean(live):
+
+    lean = live.lean #grabbing lean variable from IMU arduino
     if lean >= 0:
         lean_side = 0 #=right
     else:
         lean_side = 1 #=left
     lean_corr = round(abs(lean)) #corrected lean abs and round
 
-    global maxl, maxr #globally stored max left and max right
+    maxl, maxr = live.maxl, live.maxr #tracked from every IMU sample in consume_imu_batch
+
+    cx = LEAN_CX #center x coord
+    cy = LEAN_CY #center y coord
+    radius = LEAN_RADIUS #bounding circle radius
+
+    #Drawing lean pie slices - cached point lists per whole degree
+    ncolor = (100, 255, 100)  # slice color
+    top, bottom = lean_wedge(int(lean))
+    pygame.draw.polygon(screen, ncolor, top)
+    pygame.draw.polygon(screen, ncolor, bottom)
 
-    #maximum reassignment... if lean is greater than current max, make it equal to current max
-    if lean > maxr:
-        maxr = round(abs(lean))
-    if lean < maxl: #whoop
-        maxl = round(lean)
+    #leading lean needle
+    #lean = -- this is my variable, there are many like it but this one is mine
+    #sin/cos of 90 - lean straight from the table (0.1 degree steps)
+    i = round(abs(lean) * LEAN_LUT_STEPS) % len(LEAN_SIN)
+    nwidth = 8                              #needle width
+    ncolor = (225,120,120)                  #needle color
+    lx = radius*LEAN_SIN[i]                 #x coord of single quad value
+    ly = radius*LEAN_COS[i]                 #y coord of single quad value
 
+    #logic check to see which quadrants x and y coords need to be set to
+    if lean == 0: #vertical Line
+        pygame.draw.line(screen, ncolor, (cx, cy + radius), (cx , cy - radius), nwidth)
+    elif lean < 0: # Right Lean Q4, Q2
+        pygame.draw.line(screen, ncolor, (cx - lx, cy + ly), (cx + lx, cy - ly), nwidth)
+    else: #left lean Q1, Q3
+        pygame.draw.line(screen, ncolor, (cx + lx, cy + ly), (cx - lx, cy - ly), nwidth)
+    #slices and needle stay inside the dial, needle ends stick out half its width
+    mark_dirty("lean_dial", lean, pygame.Rect(cx - radius - 4, cy - radius - 4, 2 * radius + 8, 2 * radius + 8))
+
+    #lean stats
+    #Current Lean
+    rect = blit_number(screen, font_3, f"{lean_corr}", (255, 255, 255), 667, 230, right=True)
+    mark_dirty("lean_value", lean_corr, rect)
+
+    #Lean Side
+    if lean_side == 0: #right
+        rect = screen.blit(render_text(font_2, "R", (150, 150, 255)), (165, 235))
+    else: #left
+        rect = screen.blit(render_text(font_2, "L", (150, 150, 255)), (165, 235))
+    mark_dirty("lean_side", lean_side, rect)
+
+    #Max lean --per side
+    mark_dirty("maxl", maxl, blit_number(screen, font_2, f"{abs(maxl)}", (150, 150, 255), 155, 329))
+    mark_dirty("maxr", maxr, blit_number(screen, font_2, f"{maxr}", (150, 150, 255), 605, 329))
+
+
+def draw_lean_static(surface):
     cx = 400 #center x coord
     cy = 285 #center y coord
     radius = 150 #bounding circle radius
         #lean bounding box
-    pygame.draw.circle(screen, (255, 255, 255), (cx, cy), radius +2, 4)  # outline thickness 4
-    pygame.draw.rect(screen, (0, 0, 0), (225, 235, 350, 100))
-    pygame.draw.rect(screen, (255, 255, 255), (225, 235, 350, 100), 2)
-    pygame.draw.circle(screen, (0, 0, 0), (cx, cy), radius)  # filled
+    pygame.draw.circle(surface, (255, 255, 255), (cx, cy), radius +2, 4)  # outline thickness 4
+    pygame.draw.rect(surface, (0, 0, 0), (225, 235, 350, 100))
+    pygame.draw.rect(surface, (255, 255, 255), (225, 235, 350, 100), 2)
+    pygame.draw.circle(surface, (0, 0, 0), (cx, cy), radius)  # filled
 
     #outer radius lean ticks
     r_out = 150                  #outer radius for ticks
@@ -804,10 +2441,10 @@ def draw_lean():
     #End
     ex5 = r_in*math.cos(a5r)
     ey5 = r_in*math.sin(a5r)
-    pygame.draw.line(screen, colour, (cx+sx5,cy+sy5), (cx+ex5,cy+ey5), width) #q1 +x +y
-    pygame.draw.line(screen, colour, (cx+sx5,cy-sy5), (cx+ex5,cy-ey5), width) #q2 +x -y
-    pygame.draw.line(screen, colour, (cx-sx5,cy-sy5), (cx-ex5,cy-ey5), width) #q3 -x -y
-    pygame.draw.line(screen, colour, (cx-sx5,cy+sy5), (cx-ex5,cy+ey5), width) #q4 -x +y
+    pygame.draw.line(surface, colour, (cx+sx5,cy+sy5), (cx+ex5,cy+ey5), width) #q1 +x +y
+    pygame.draw.line(surface, colour, (cx+sx5,cy-sy5), (cx+ex5,cy-ey5), width) #q2 +x -y
+    pygame.draw.line(surface, colour, (cx-sx5,cy-sy5), (cx-ex5,cy-ey5), width) #q3 -x -y
+    pygame.draw.line(surface, colour, (cx-sx5,cy+sy5), (cx-ex5,cy+ey5), width) #q4 -x +y
 
     #40 ticks ======
     #Start
@@ -816,10 +2453,10 @@ def draw_lean():
     #End
     ex4 = r_in * math.cos(a4r)
     ey4 = r_in * math.sin(a4r)
-    pygame.draw.line(screen, colour, (cx + sx4, cy + sy4), (cx + ex4, cy + ey4), width)  # q1 +x +y
-    pygame.draw.line(screen, colour, (cx + sx4, cy - sy4), (cx + ex4, cy - ey4), width)  # q2 +x -y
-    pygame.draw.line(screen, colour, (cx - sx4, cy - sy4), (cx - ex4, cy - ey4), width)  # q3 -x -y
-    pygame.draw.line(screen, colour, (cx - sx4, cy + sy4), (cx - ex4, cy + ey4), width)  # q4 -x +y
+    pygame.draw.line(surface, colour, (cx + sx4, cy + sy4), (cx + ex4, cy + ey4), width)  # q1 +x +y
+    pygame.draw.line(surface, colour, (cx + sx4, cy - sy4), (cx + ex4, cy - ey4), width)  # q2 +x -y
+    pygame.draw.line(surface, colour, (cx - sx4, cy - sy4), (cx - ex4, cy - ey4), width)  # q3 -x -y
+    pygame.draw.line(surface, colour, (cx - sx4, cy + sy4), (cx - ex4, cy + ey4), width)  # q4 -x +y
     #30 ticks ======
     #Start
     sx3 = r_out * math.cos(a3r)
@@ -827,216 +2464,300 @@ def draw_lean():
     #End
     ex3 = r_in * math.cos(a3r)
     ey3 = r_in * math.sin(a3r)
-    pygame.draw.line(screen, colour, (cx + sx3, cy + sy3), (cx + ex3, cy + ey3), width)  # q1 +x +y
-    pygame.draw.line(screen, colour, (cx + sx3, cy - sy3), (cx + ex3, cy - ey3), width)  # q2 +x -y
-    pygame.draw.line(screen, colour, (cx - sx3, cy - sy3), (cx - ex3, cy - ey3), width)  # q3 -x -y
-    pygame.draw.line(screen, colour, (cx - sx3, cy + sy3), (cx - ex3, cy + ey3), width)  # q4 -x +y
+    pygame.draw.line(surface, colour, (cx + sx3, cy + sy3), (cx + ex3, cy + ey3), width)  # q1 +x +y
+    pygame.draw.line(surface, colour, (cx + sx3, cy - sy3), (cx + ex3, cy - ey3), width)  # q2 +x -y
+    pygame.draw.line(surface, colour, (cx - sx3, cy - sy3), (cx - ex3, cy - ey3), width)  # q3 -x -y
+    pygame.draw.line(surface, colour, (cx - sx3, cy + sy3), (cx - ex3, cy + ey3), width)  # q4 -x +y
 
     #Zeroes
-    pygame.draw.line(screen, colour, (cx,cy + radius), (cx,cy -radius), 2) #Vertical Line
-    pygame.draw.line(screen, colour, (cx + 175,cy), (cx - 175,cy), 2)      #Horizontal Line
+    pygame.draw.line(surface, colour, (cx,cy + radius), (cx,cy -radius), 2) #Vertical Line
+    pygame.draw.line(surface, colour, (cx + 175,cy), (cx - 175,cy), 2)      #Horizontal Line
 
-    #Drawing lean pie slices
-    ncolor = (100, 255, 100)  # slice color
-    steps = 1  # degrees per step
-
-        #top slice
-    points = [(cx, cy)]  # center
-    # Determine direction: positive = left, negative = right
-    if lean >= 0:  # left lean
-        start = 0
-        end = int(lean)
-        step_sign = 1
-    else:  # right lean
-        start = 0
-        end = int(lean)
-        step_sign = -1
-    # Generate points along the needle path across the circle
-    for a in range(start, end + step_sign, step_sign):
-        rad = math.radians(90 + a)  # mirror to match needle orientation
-        x = cx + radius * math.cos(rad)
-        y = cy - radius * math.sin(rad)
-        points.append((x, y))
-    # Ensure at least 3 points
-    if len(points) < 3:
-        points.append((cx, cy - radius))
-        points.append((cx, cy + radius))
-
-    # Draw top slice
-    pygame.draw.polygon(screen, ncolor, points)
-        #bottom slice
-    points = [(cx, cy)]  # center
-    # Determine direction: positive = left, negative = right
-    if lean >= 0:  # left lean
-        start = 0
-        end = int(lean)
-        step_sign = 1
-    else:  # right lean
-        start = 0
-        end = int(lean)
-        step_sign = -1
-    # Generate points along the needle path across the circle
-    for a in range(start, end + step_sign, step_sign):
-        rad = math.radians(90 + a)  # mirror to match needle orientation
-        x = cx - radius * math.cos(rad)
-        y = cy + radius * math.sin(rad)
-        points.append((x, y))
-    # Ensure at least 3 points
-    if len(points) < 3:
-        points.append((cx, cy - radius))
-        points.append((cx, cy + radius))
-    # Draw bottom slice
-    pygame.draw.polygon(screen, ncolor, points)
+    #lean stat boxes
+    pygame.draw.rect(surface, (0, 0, 0), (575, 235, 100, 100)) #current
+    pygame.draw.rect(surface, (255, 255, 255), (575, 235, 100, 100), 2)
+    pygame.draw.rect(surface, (0, 0, 0), (150, 235, 75, 100)) #side
+    pygame.draw.rect(surface, (255, 255, 255), (150, 235, 75, 100), 2)
 
+    pygame.draw.rect(surface, (0, 0, 0), (100, 340, 150, 70)) #max left
+    pygame.draw.rect(surface, (255, 255, 255), (100, 340, 150, 70), 2)
+    surface.blit(font_1_3.render(f"M", True, (150, 150, 255)), (108, 345))
+    surface.blit(font_1_3.render(f"L", True, (150, 150, 255)), (108, 375))
 
-    #leading lean needle
-    #lean = -- this is my variable, there are many like it but this one is mine
-    leanphi = 90 - abs(lean)                #lean inverted
-    leanphir = math.radians(leanphi)        #lean inv converted to radians
-    nwidth = 8                              #needle width
-    ncolor = (225,120,120)                  #needle color
-    lx = radius*math.cos(leanphir)          #x coord of single quad value
-    ly = radius*math.sin(leanphir)          #y coord of single quad value
-
-    #logic check to see which quadrants x and y coords need to be set to
-    if lean == 0: #vertical Line
-        pygame.draw.line(screen, ncolor, (cx, cy + radius), (cx , cy - radius), nwidth)
-    elif lean < 0: # Right Lean Q4, Q2
-        pygame.draw.line(screen, ncolor, (cx - lx, cy + ly), (cx + lx, cy - ly), nwidth)
-    else: #left lean Q1, Q3
-        pygame.draw.line(screen, ncolor, (cx + lx, cy + ly), (cx - lx, cy - ly), nwidth)
-
-    #lean stats
-    #Current Lean
-    pygame.draw.rect(screen, (0, 0, 0), (575, 235, 100, 100))
-    pygame.draw.rect(screen, (255, 255, 255), (575, 235, 100, 100), 2)
-    x_right = 667
-    text = font_3.render(f"{lean_corr}", True, (255, 255, 255))
-    text_x = x_right - text.get_width()
-    screen.blit(text, (text_x, 230))
-
-    #Lean Side
-    pygame.draw.rect(screen, (0, 0, 0), (150, 235, 75, 100))
-    pygame.draw.rect(screen, (255, 255, 255), (150, 235, 75, 100), 2)
-    if lean_side == 0: #right
-        screen.blit(font_2.render(f"R", True, (150, 150, 255)), (165, 235))
-    else: #left
-        screen.blit(font_2.render(f"L", True, (150, 150, 255)), (165, 235))
-
-    #Max lean --per side
-    pygame.draw.rect(screen, (0, 0, 0), (100, 340, 150, 70))
-    pygame.draw.rect(screen, (255, 255, 255), (100, 340, 150, 70), 2)
-    screen.blit(font_1_3.render(f"M", True, (150, 150, 255)), (108, 345))
-    screen.blit(font_1_3.render(f"L", True, (150, 150, 255)), (108, 375))
-    screen.blit(font_2.render(f"{abs(maxl)}", True, (150, 150, 255)), (155, 329))
-
-    pygame.draw.rect(screen, (0, 0, 0), (550, 340, 150, 70))
-    pygame.draw.rect(screen, (255, 255, 255), (550, 340, 150, 70), 2)
-    screen.blit(font_1_3.render(f"M", True, (150, 150, 255)), (558, 345))
-    screen.blit(font_1_3.render(f"R", True, (150, 150, 255)), (558, 375))
-    screen.blit(font_2.render(f"{maxr}", True, (150, 150, 255)), (605, 329))
+    pygame.draw.rect(surface, (0, 0, 0), (550, 340, 150, 70)) #max right
+    pygame.draw.rect(surface, (255, 255, 255), (550, 340, 150, 70), 2)
+    surface.blit(font_1_3.render(f"M", True, (150, 150, 255)), (558, 345))
+    surface.blit(font_1_3.render(f"R", True, (150, 150, 255)), (558, 375))
 
 
 # ============================================================
 #               TRAIL FUNCTION
 # ============================================================
 
-def draw_trail():
+def draw_trail(live):
 
     # Variables
-    brake_raw = imu_data["brake"]  # 0–1900 psi
-    brakemaxrange = 1000  # max psi to scale to 100%
-    throttle = tps  # 0–100 scale
-    lean_raw = abs(imu_data["lean"])  # degrees
-    leanrange = 50  # 50° = 100%
-    global graph_duration
-    global maxbrake
-
-    # Convert raw data to percent
-    brake = min(100, (brake_raw / brakemaxrange) * 100)
-    lean = min(100, (lean_raw / leanrange) * 100)
-    throttle = max(0, min(100, throttle))  # ensure 0–100
-
-    #stored maximum brake pressure
-    if brake_raw > maxbrake:
-        maxbrake = brake_raw
-
-    # Store history for graphing
-    add_sample(lean_history, lean)
-    add_sample(brake_history, brake)
-    add_sample(throttle_history, throttle)
+    maxbrake = live.maxbrake
 
+    # History for graphing - lean and brake (and maxbrake) come in with every IMU sample, see consume_imu_batch,
+    # throttle from the sampler (TELEMETRY SAMPLER)
+
+    # Draw graphs - lean blue, brake red, throttle green
+    trail_plot.draw(screen, time.monotonic())
+    mark_dirty("trail_graph", DIRTY_ALWAYS, TRAIL_PLOT_AREA)
+
+    #max brake
+    value = blit_number(screen, font_1_5, f"{maxbrake}", (200, 0, 0), 265, 419)
+    unit = screen.blit(render_text(font_1_5, " psi", (200, 0, 0)), (value.right, 419))
+    mark_dirty("maxbrake", maxbrake, value.union(unit))
+
+
+def draw_trail_static(surface):
     # Background box
-    pygame.draw.rect(screen, (0, 0, 0), (142, 130, 575, 287))
-    pygame.draw.rect(screen, (255, 255, 255), (142, 130, 575, 287), 3)
+    pygame.draw.rect(surface, (0, 0, 0), (142, 130, 575, 287))
+    pygame.draw.rect(surface, (255, 255, 255), (142, 130, 575, 287), 3)
 
     # Ticks
-    pygame.draw.line(screen, (205, 205, 205), (150, 330), (670, 330), 1)
-    screen.blit(font_1_2.render("25", True, (255, 255, 255)), (675, 320))
-    pygame.draw.line(screen, (205, 205, 205), (150, 270), (670, 270), 1)
-    screen.blit(font_1_2.render("50", True, (255, 255, 255)), (675, 260))
-    pygame.draw.line(screen, (205, 205, 205), (150, 210), (670, 210), 1)
-    screen.blit(font_1_2.render("75", True, (255, 255, 255)), (675, 200))
-    pygame.draw.line(screen, (205, 205, 205), (150, 150), (670, 150), 1)
-    screen.blit(font_1_2.render("100", True, (255, 255, 255)), (675, 140))
+    pygame.draw.line(surface, (205, 205, 205), (150, 330), (670, 330), 1)
+    surface.blit(font_1_2.render("25", True, (255, 255, 255)), (675, 320))
+    pygame.draw.line(surface, (205, 205, 205), (150, 270), (670, 270), 1)
+    surface.blit(font_1_2.render("50", True, (255, 255, 255)), (675, 260))
+    pygame.draw.line(surface, (205, 205, 205), (150, 210), (670, 210), 1)
+    surface.blit(font_1_2.render("75", True, (255, 255, 255)), (675, 200))
+    pygame.draw.line(surface, (205, 205, 205), (150, 150), (670, 150), 1)
+    surface.blit(font_1_2.render("100", True, (255, 255, 255)), (675, 140))
 
     # Main axes
-    pygame.draw.line(screen, (245, 245, 245), (150, 390), (660, 390), 3)
-    pygame.draw.line(screen, (245, 245, 245), (660, 150), (660, 390), 3)
-
-    #Time interval
-    screen.blit(font_1_2.render(f"{graph_duration} Seconds", True, (255, 255, 255)), (160, 390))
+    pygame.draw.line(surface, (245, 245, 245), (150, 390), (660, 390), 3)
+    pygame.draw.line(surface, (245, 245, 245), (660, 150), (660, 390), 3)
 
-    # Draw graphs
-    draw_trailing_graph(screen, lean_history, (0, 100, 255))  # blue
-    draw_trailing_graph(screen, brake_history, (200, 0, 0))  # red
-    draw_trailing_graph(screen, throttle_history, (0, 200, 0))  # green
+    #Time interval - changing graph_duration needs invalidate_static_layers()
+    if graph_duration < 60:
+        label = f"{graph_duration:g} Seconds"
+    else:
+        label = f"{graph_duration / 60:g} Minutes"
+    surface.blit(font_1_2.render(label, True, (255, 255, 255)), (160, 390))
 
     #max brake
-    pygame.draw.rect(screen, (0, 0, 0), (160, 420, 300, 59))
-    pygame.draw.rect(screen, (255, 255, 255), (160, 420, 300, 59), 3)
-    screen.blit(font_1_3.render("Max", True, (255, 255, 255)), (172, 422))
-    screen.blit(font_1_3.render("Brake", True, (255, 255, 255)), (168, 446))
-    screen.blit(font_1_5.render(f"{maxbrake} psi", True, (200, 0, 0)), (265, 419))
+    pygame.draw.rect(surface, (0, 0, 0), (160, 420, 300, 59))
+    pygame.draw.rect(surface, (255, 255, 255), (160, 420, 300, 59), 3)
+    surface.blit(font_1_3.render("Max", True, (255, 255, 255)), (172, 422))
+    surface.blit(font_1_3.render("Brake", True, (255, 255, 255)), (168, 446))
 
 # ============================================================
 #               TRAILING GRAPH LINES
 # ============================================================
 
-def draw_trailing_graph(screen, history, color):
-    now =time.time()
+TRAIL_X_MIN = 150
+TRAIL_X_MAX = 660
+TRAIL_PLOT_AREA = pygame.Rect(148, 144, 524, 252) #everything the graph lines and end dots can touch
+TRAIL_KEY = (255, 0, 255) #transparent colour of the plot surface
+
 
-    x_min = 150
-    x_max = 660
-    width = x_max - x_min
+class TrailLevel:
+    """
+    One window of a trail series decimated to per-pixel-column buckets.
+    Each finished bucket leaves its min and max as points (in the order they happened),
+    so at most two vertices per column whatever the sample rate, and spikes always survive.
+    """
 
-    points = []
+    def __init__(self, name, window, columns):
+        self.window = window
+        self.width = window / columns #seconds per bucket
+        #(timestamp, value) of finished buckets, oldest first - two per column plus the buckets on the edges
+        self.points = series_store.add(name, 2 * columns + 8)
+        self.start = None #open bucket
+        self.lo = self.hi = 0.0
+        self.lo_t = self.hi_t = 0.0
+
+    def add(self, t, v):
+        if self.start is None or t >= self.start + self.width:
+            if self.start is not None:
+                self._close()
+            self.start = t - t % self.width #buckets line up with absolute time
+            self.lo = self.hi = v
+            self.lo_t = self.hi_t = t
+        elif v < self.lo:
+            self.lo, self.lo_t = v, t
+        elif v > self.hi:
+            self.hi, self.hi_t = v, t
+
+    def _close(self):
+        points = self.points
+        if self.lo_t == self.hi_t:
+            points.append(self.lo_t, self.lo)
+        elif self.lo_t < self.hi_t:
+            points.append(self.lo_t, self.lo)
+            points.append(self.hi_t, self.hi)
+        else:
+            points.append(self.hi_t, self.hi)
+            points.append(self.lo_t, self.lo)
+        points.expire(self.start - self.window)
+
+
+class TrailHistory:
+    """
+    A trail series kept at every window in TRAIL_WINDOWS at once (a small pyramid of min/max levels),
+    so switching windows draws straight away and every window costs the same number of vertices.
+    """
 
-    for t, v in history:
-        dt = now - t
-        x = x_max - (dt / graph_duration) * width
-        if x >= x_min:
-            points.append((x, percent_to_y(v)))
+    def __init__(self, name, windows=TRAIL_WINDOWS, columns=TRAIL_X_MAX - TRAIL_X_MIN):
+        self.levels = [TrailLevel(f"{name}_{window:g}s", window, columns) for window in windows]
+        self.last = None #newest raw (timestamp, value)
 
-    # Draw the line
-    if len(points) > 1:
-        pygame.draw.lines(screen, color, False, points, 4)
+    def add(self, t, v):
+        self.last = (t, v)
+        for level in self.levels:
+            level.add(t, v)
 
-    # Draw current value dot (right side)
-    if points:
-        pygame.draw.circle(screen, color, (int(points[-1][0]), int(points[-1][1])), 5)
+    def points(self, window):
+        #RingSeries of the level for TRAIL_WINDOWS[window]
+        return self.levels[window].points
+
+
+lean_history = TrailHistory("lean")
+brake_history = TrailHistory("brake")
+throttle_history = TrailHistory("throttle")
+
+
+class TrailPlot:
+    """
+    The trail graph lines (trail_window level of each TrailHistory) kept on a persistent colour-keyed surface.
+    Each frame the surface scrolls left by the whole pixels the time axis moved and only the
+    segments of samples added since the last frame are drawn at the right edge.
+    """
+
+    def __init__(self, area, series):
+        self.area = area
+        self.series = series #[(history, color)] drawn in this order
+        self.surface = None
+        self.duration = None
+
+    def rebuild(self, now):
+        #New surface with everything in the histories, on first use and when graph_duration changes
+        if self.surface is None:
+            self.surface = pygame.Surface(self.area.size).convert()
+            self.surface.set_colorkey(TRAIL_KEY)
+        self.surface.fill(TRAIL_KEY)
+        self.duration = graph_duration
+        self.pps = (TRAIL_X_MAX - TRAIL_X_MIN) / graph_duration #pixels per second
+        self.t_right = now #time at TRAIL_X_MAX on the surface
+        self.last = [None] * len(self.series) #newest (t, v) drawn per series
+
+    def _point(self, t, v):
+        return (TRAIL_X_MAX - self.area.x - (self.t_right - t) * self.pps, percent_to_y(v) - self.area.y)
+
+    def draw(self, target, now):
+        if self.surface is None or self.duration != graph_duration:
+            self.rebuild(now)
+
+        #scroll by whole pixels, the fraction is carried in t_right
+        surface = self.surface
+        shift = int((now - self.t_right) * self.pps)
+        if shift > 0:
+            width, height = surface.get_size()
+            if shift >= width:
+                surface.fill(TRAIL_KEY)
+            else:
+                surface.scroll(-shift, 0)
+                surface.fill(TRAIL_KEY, (width - shift, 0, shift, height))
+            self.t_right += shift / self.pps
+
+        #only the samples newer than what is already on the surface
+        for i, (history, color) in enumerate(self.series):
+            series = history.points(trail_window)
+            last = self.last[i]
+            pieces = series.views(0 if last is None else series.after(last[0]))
+            if not pieces:
+                continue
+            points = [self._point(*last)] if last else []
+            for ts, vs in pieces:
+                points += [self._point(t, v) for t, v in zip(ts, vs)]
+            if len(points) > 1:
+                pygame.draw.lines(surface, color, False, points, 4)
+            self.last[i] = series.newest()
+
+        target.blit(surface, self.area)
+
+        # Draw current value dot (right side)
+        for history, color in self.series:
+            if history.last:
+                t, v = history.last
+                x = TRAIL_X_MAX - max(0.0, now - t) * self.pps
+                if x >= TRAIL_X_MIN:
+                    pygame.draw.circle(target, color, (int(x), int(percent_to_y(v))), 5)
+
+
+trail_plot = TrailPlot(TRAIL_PLOT_AREA, [(lean_history, (0, 100, 255)), (brake_history, (200, 0, 0)),
+                                         (throttle_history, (0, 200, 0))])
 
 # ============================================================
 #               TRAIL SAMPLE HELPER
 # ============================================================
 
-def add_sample(history, value):
-    now = time.time()
-    history.append((now, value))
+def add_sample(history, value, now=None):
+    if now is None:
+        now = time.monotonic()
+    history.add(now, value)
 
-    cutoff = now - graph_duration
-    while history and history[0][0] < cutoff:
-        history.pop(0)
+
+def cycle_trail_window():
+    #Next trail window, the plot and the "Seconds" label get redrawn for it
+    global trail_window, graph_duration
+    trail_window = (trail_window + 1) % len(TRAIL_WINDOWS)
+    graph_duration = TRAIL_WINDOWS[trail_window]
+    invalidate_static_layers()
+
+# ============================================================
+#               TELEMETRY SAMPLER
+# ============================================================
+
+SAMPLE_MAX_GAP = 1.0 #seconds - further off than this either way (clock step, stalled loop) restarts sampling instead of filling the gap
+
+
+class Sampler:
+    """
+    Samples the channels that don't come with their own sample stream - the G dot trail and the throttle trail -
+    at SAMPLE_RATE, whatever screen is up and however long frames take, so the draw functions only read.
+    IMU samples come in through imu() in time order, each tick gets the newest one before it.
+    Throttle is held from the frame's telemetry snapshot.
+    """
+    __slots__ = ("period", "next_t", "lat", "long", "throttle")
+
+    def __init__(self, rate):
+        self.period = 1.0 / rate
+        self.next_t = None #time of the next tick, None until the first run()
+        self.lat = 0.0
+        self.long = 0.0
+        self.throttle = 0
+
+    def imu(self, t, ax, ay):
+        if self.next_t is not None:
+            self._ticks(t) #ticks before this sample still get the previous one
+        self.lat = ax #x axis
+        self.long = ay #y axis
+
+    def run(self, now, live):
+        #Once per loop after the frame's input: every tick up to now, then the G dots older than the trail expire
+        self.throttle = max(0, min(100, live.tps))  # 0–100 scale
+        if self.next_t is None:
+            self.next_t = now
+        self._ticks(now)
+        g_history.expire(now - G_TRAIL_SECONDS)
+
+    def _ticks(self, until):
+        tick = self.next_t
+        if abs(until - tick) > SAMPLE_MAX_GAP: #stalled, or the clock stepped - a backwards step would leave tick in the future
+            tick = until
+        period = self.period
+        while tick <= until:
+            g_history.append(tick, G_CX + G_SCALE * self.lat, G_CY + G_SCALE * self.long)
+            throttle_history.add(tick, self.throttle)
+            tick += period
+        self.next_t = tick
+
+
+sampler = Sampler(SAMPLE_RATE)
 
 # ============================================================
 #               TRAIL Y MAPPING
@@ -1051,55 +2772,92 @@ def percent_to_y(p):
 #               BASE LAYOUT FUNCTION
 # ============================================================
 
-def draw_base_layout():
-#Base layout rectangles
-        #rpm bar and values
-    pygame.draw.rect(screen, (0, 0, 0), (0, 0, 800, 128))  # filled black box
-    pygame.draw.rect(screen, (255, 255, 255), (0, 0, 800, 128), 2)  # white outline (3px thick)
-        #Gear
-    pygame.draw.rect(screen, (0, 0, 0), (0, 120, 140, 160))
-    pygame.draw.rect(screen, (255, 255, 255), (0, 120, 140, 160), 3)
-        #temps
-    pygame.draw.rect(screen, (0, 0, 0), (0, 420, 140, 60))
-    pygame.draw.rect(screen, (255, 255, 255), (0, 420, 140, 60), 3)
-        #time
-    pygame.draw.rect(screen, (0, 0, 0), (670, 420, 130, 60))
-    pygame.draw.rect(screen, (255, 255, 255), (670, 420, 130, 60), 3)
-        #connections
-    pygame.draw.rect(screen, (0, 0, 0), (510, 420, 160, 60))
-    pygame.draw.rect(screen, (255, 255, 255), (510, 420, 160, 60), 3)
-
-    #Base Layout data
+def draw_base_layout(live):
+    #Live values of the base layout, the boxes are in the static layer (draw_base_static)
+    gear = live.gear
         #Gear
     display_gear = "N" if gear == 0 else str(gear)
     gear_color = (0, 255, 0) if display_gear == "N" else (255, 255, 255)
-    screen.blit(font_10.render(display_gear, True, gear_color), (25, 100))
+    rect = blit_number(screen, font_10, display_gear, gear_color, 25, 100) #"N" comes from the text cache
+    mark_dirty("gear", (display_gear, gear_color), rect)
         #RPM
-    draw_rpm_bar(screen, rpm)
-        #RPM values
-    screen.blit(font_1_2.render(f"5", True, (255, 255, 255)), (245, 100))
-    screen.blit(font_1_2.render(f"10", True, (255, 255, 255)), (492, 100))
-    screen.blit(font_1_2.render(f"15", True, (255, 255, 255)), (742, 100))
+    draw_rpm_bar(screen, live.rpm)
 
         #Coolant Temp
-    draw_coolant_temp(screen, coolant, x_right=90, y=421)
+    draw_coolant_temp(screen, live.coolant, x_right=90, y=421)
 
         #Time 24h
     #need to get the can hat to see the rtc and which one it is.
     #standin time
-    draw_RTCtime()
-    screen.blit(font_1_5.render(f"00:00", True, (255, 255, 255)), (685, 422))
+    rect = draw_RTCtime()
+    rect = rect.union(blit_number(screen, font_1_5, "00:00", (255, 255, 255), 685, 422))
+    mark_dirty("clock", "00:00", rect)
         #Connections
     draw_connections()
 
+
+def draw_base_static(surface):
+#Base layout rectangles
+        #rpm bar and values
+    pygame.draw.rect(surface, (0, 0, 0), (0, 0, 800, 128))  # filled black box
+    pygame.draw.rect(surface, (255, 255, 255), (0, 0, 800, 128), 2)  # white outline (3px thick)
+        #Gear
+    pygame.draw.rect(surface, (0, 0, 0), (0, 120, 140, 160))
+    pygame.draw.rect(surface, (255, 255, 255), (0, 120, 140, 160), 3)
+        #temps
+    pygame.draw.rect(surface, (0, 0, 0), (0, 420, 140, 60))
+    pygame.draw.rect(surface, (255, 255, 255), (0, 420, 140, 60), 3)
+        #time
+    pygame.draw.rect(surface, (0, 0, 0), (670, 420, 130, 60))
+    pygame.draw.rect(surface, (255, 255, 255), (670, 420, 130, 60), 3)
+        #connections
+    pygame.draw.rect(surface, (0, 0, 0), (510, 420, 160, 60))
+    pygame.draw.rect(surface, (255, 255, 255), (510, 420, 160, 60), 3)
+
+        #RPM values
+    surface.blit(font_1_2.render(f"5", True, (255, 255, 255)), (245, 100))
+    surface.blit(font_1_2.render(f"10", True, (255, 255, 255)), (492, 100))
+    surface.blit(font_1_2.render(f"15", True, (255, 255, 255)), (742, 100))
+        #Coolant unit
+    surface.blit(font_1_5.render(f" C", True, (255, 255, 255)), (90, 421))
+
 # ============================================================
 #               CONNECTIONS FUNCTION / And / CLOCK RTC FUNCTION
 # ============================================================
+CONN_COLORS = {"up": (0, 255, 0), "down": (255, 0, 0), "off": (120, 120, 120)}
+
+
 def draw_connections():
-    screen.blit(font_1_5.render(f"00:00", True, (255, 255, 255)), (685, 422))
+    #One column per source in the connections box: name coloured by state, reconnect count under it
+    if connections is None:
+        return
+    x = 515
+    status = connections.status()
+    rect = pygame.Rect(x, 424, 0, 0)
+    for name, state, reconnects in status:
+        color = CONN_COLORS[state]
+        rect.union_ip(screen.blit(render_text(font_1_2, name.upper(), color), (x, 424)))
+        rect.union_ip(blit_number(screen, font_1_2, f"{reconnects}", (255, 255, 255), x, 450))
+        x += 52
+    mark_dirty("connections", tuple(status), rect)
 
 def draw_RTCtime():
-    screen.blit(font_1_5.render(f"1 , 2 , 3", True, (255, 255, 255)), (685, 422))
+    return screen.blit(render_text(font_1_5, "1 , 2 , 3", (255, 255, 255)), (685, 422))
+
+
+# ============================================================
+#               FRAME TIME STATS
+# ============================================================
+
+def print_frame_stats(frame_times):
+    #Summary printed at exit, compare runs of the same replay log to catch slowdowns
+    if not frame_times:
+        return
+    times = sorted(frame_times)
+    n = len(times)
+    avg = sum(times) / n
+    print(f"[FRAMES] {n} frames  avg {avg * 1000:.2f} ms  p50 {times[n // 2] * 1000:.2f} ms  "
+          f"p95 {times[int(n * 0.95)] * 1000:.2f} ms  max {times[-1] * 1000:.2f} ms")
 
 
 # ============================================================
@@ -1107,14 +2865,43 @@ def draw_RTCtime():
 # ============================================================
 
 def main():
-    bus = init_can()
-    ser_imu = init_serial()         # initialize ard
-    ser_btn = init_button_serial()  # initialize button serial #thius structure forces that code to use the data or ignore it completely
-    show_splash()
+    global connections, DEBUG_DIRTY
+    start = boot_mark("import", BOOT_T0)
+    shared = None
+    if ACQUISITION_PROCESS:
+        #before the display comes up, the acquisition process has no use for SDL
+        shared, acquisition, acq_stop, boot_info = start_acquisition()
+        connections = shared #draw_connections reads the states from the block
+        start = boot_mark("acquisition", start)
+    init_display()
+    start = boot_mark("display", start)
+    font_file(FONT_NAME) #the one system font lookup
+    start = boot_mark("fonts", start)
+
+    if shared:
+        devices = threading.Thread(target=wait_for_acquisition, args=(boot_info,), name="BootDevices", daemon=True)
+        devices.start()
+    else:
+        can_reader, btn_reader = setup_sources()
+        #devices come up behind the splash, then retries and hot-plug in the background
+        devices = threading.Thread(target=connect_devices, name="BootDevices", daemon=True)
+        devices.start()
+        if can_reader:
+            can_reader.start()
+        btn_reader.start()
+    show_splash(devices)
+    start = boot_mark("splash", start)
+    build_static_layers() #whatever the splash didn't get to
+    boot_mark("layers", start)
+    print_boot_times()
+    print("[SERIES]", series_store.stats())
     current_screen = 1
     running = True
+    frame_times = deque(maxlen=FPS * 600) #render time of the last 10 min of frames (s), for spotting regressions
+    loop_start = time.perf_counter()
 
     while running:
+        frame_start = time.perf_counter()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -1124,41 +2911,62 @@ def main():
                     current_screen = 1 if current_screen == 5 else current_screen + 1
                 elif event.key == pygame.K_LEFT:  # left arrow
                     current_screen = 5 if current_screen == 1 else current_screen - 1
-
-        # SERIAL ONLY — no filtering applied
-        read_serial(ser_imu)
-
-        # --- BUTTON INPUT HANDLING --- black right red left
-        read_buttons()  # update global button states
-        global btn1_short_press, btn2_short_press  # access globals
-        if btn2_short_press:
-            current_screen = 5 if current_screen == 1 else current_screen - 1  # left
-            btn2_short_press = False  # reset immediately
-        if btn1_short_press:
-            current_screen = 1 if current_screen == 5 else current_screen + 1  # right
-            btn1_short_press = False  # reset immediately
-
-        if INPUT_MODE == "REAL" and bus:
-            msg = bus.recv(timeout=0.01)
-            if msg:
-                process_can_frame(msg)
+                elif event.key == pygame.K_w and current_screen == 5:  # next trail window
+                    cycle_trail_window()
+                elif event.key == pygame.K_d:  # show/hide the dirty region outlines
+                    DEBUG_DIRTY = not DEBUG_DIRTY
+                    request_full_refresh()
+
+        if shared:
+            #everything comes out of the shared block, the IMU samples for the trail histories and the sampler
+            live, button_events, samples = shared.read()
+            add_imu_history(samples)
+        else:
+            # SERIAL ONLY — no filtering applied
+            poll_imu()
+            button_events = read_button_events(btn_reader)
+            live = telemetry.front #one snapshot for the whole frame, producers can publish meanwhile
+        sampler.run(time.monotonic(), live) #G dot and throttle trails, at SAMPLE_RATE on every screen
+
+        # --- BUTTON INPUT HANDLING --- black right red left, hold red to reset the max values, hold black on Trail for the next time window
+        for kind, button in button_events:
+            if kind == "short" and button == 2:
+                current_screen = 5 if current_screen == 1 else current_screen - 1  # left
+            elif kind == "short" and button == 1:
+                current_screen = 1 if current_screen == 5 else current_screen + 1  # right
+            elif kind == "long" and button == 2 and not shared: #the acquisition process resets its own peaks
+                reset_peaks()
+            elif kind == "long" and button == 1 and current_screen == 5:
+                cycle_trail_window()
 
         if current_screen == 1:  # Main
-            screen_1()
+            screen_1(live)
         elif current_screen == 2:  # Laptimer
-            screen_2()
+            screen_2(live)
         elif current_screen == 3:  # Lean
-            screen_3()
+            screen_3(live)
         elif current_screen == 4:  # Gforce
-            screen_4()
+            screen_4(live)
         elif current_screen == 5:  # Trail
-            screen_5()
+            screen_5(live)
 
-        pygame.display.update()
+        present() #only the regions that changed
+        frame_times.append(time.perf_counter() - frame_start)
         clock.tick(FPS)
 
+    run_time = time.perf_counter() - loop_start
+    print_frame_stats(frame_times)
+    print_dirty_stats()
+    print("[TEXT] Cache stats:", text_cache.stats(), f"{len(digit_atlases)} digit atlases")
+    if shared:
+        acq_stop.set()
+        acquisition.join(timeout=2)
+        print(f"[SHM] {shared.state.seq} updates  {shared.torn_reads} torn reads retried  "
+              f"{shared.imu_dropped} IMU samples dropped")
+        shared.close(unlink=True)
+    else:
+        stop_sources(can_reader, btn_reader, run_time)
     pygame.quit()
 
-
 if __name__ == "__main__":
     main()
@@ -1,14 +1,137 @@
 #use this to probe for a serial input from the arduino
 
-import serial, time
-
-try:
-    print("Opening COM6...")
-    ser = serial.Serial("COM6", 115200, timeout=1)
-    time.sleep(2)
-    print("Connected OK!")
-    print("Testing read...")
-    line = ser.readline()
-    print("Read:", line)
-except Exception as e:
-    print("ERROR:", e)
+"""
+Serial probe / auto-discovery for the dash Arduinos
+--------------------------------
+Opens every USB serial port at once and works out what is on each one from what it sends:
+- "imu"  : IMU_TRA key:value CSV (LEAN:..,AX:..) or binary IMU packets
+- "btn"  : Dash_btns "b1,b2" lines
+- "fake" : Fake_DASH_input generator (RPM:..,SPD:.. or its startup banner)
+
+    python3 SerialTest.py            scan everything and print the role -> port map
+    python3 SerialTest.py COM6       just dump what one port sends
+
+PyDashMain uses discover_ports() when SERIAL_PORT1/SERIAL_PORT2 are set to "AUTO".
+Every port is probed in its own thread so the scan takes as long as the slowest single probe.
+"""
+
+import glob
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import serial
+
+PROBE_BAUD = 115200
+PROBE_TIMEOUT = 6.0 #Arduinos reset when the port opens, and the fake generator waits 5s before its banner
+
+BTN_LINE = re.compile(rb"^\(?[01],[01](,\d+)?\)?$")
+BINARY_PACKET = re.compile(rb"\x00[\x01-\xff]\xa5") #end of one COBS frame, code byte, 0xA5 sync of the next
+
+
+def candidate_ports():
+    """
+    Every USB serial device once, named by its most stable path:
+    /dev/serial/by-path (fixed per USB socket) over /dev/serial/by-id over the raw ttyUSB/ttyACM name.
+    """
+    ports = {}
+    for pattern in ("/dev/ttyUSB*", "/dev/ttyACM*", "/dev/serial/by-id/*", "/dev/serial/by-path/*"):
+        for path in sorted(glob.glob(pattern)):
+            ports[os.path.realpath(path)] = path #later patterns are more stable and win
+    return sorted(ports.values())
+
+
+def classify(data):
+    #Role from raw bytes a device sent, None if nothing recognisable yet
+    if BINARY_PACKET.search(data):
+        return "imu"
+    for line in data.split(b"\n"):
+        line = line.strip()
+        if b"RPM:" in line or line.startswith(b"Starting fake"):
+            return "fake"
+        if b"LEAN:" in line:
+            return "imu"
+        if BTN_LINE.match(line) or line.startswith(b"working"):
+            return "btn"
+    return None
+
+
+def probe(port, baud=PROBE_BAUD, timeout=PROBE_TIMEOUT):
+    """
+    Listens on one port until it can tell what the device is, or timeout runs out.
+    Returns the role or None.
+    """
+    try:
+        ser = serial.Serial(port, baud, timeout=0.1)
+    except (serial.SerialException, OSError):
+        return None
+    data = bytearray()
+    end = time.monotonic() + timeout
+    try:
+        while time.monotonic() < end:
+            chunk = ser.read(max(1, ser.in_waiting))
+            if not chunk:
+                continue
+            data += chunk
+            #only judge complete lines/packets
+            role = classify(bytes(data[:max(data.rfind(b"\n"), data.rfind(b"\x00")) + 1]))
+            if role:
+                return role
+            del data[:-4096] #plenty for a few lines
+    except (serial.SerialException, OSError):
+        return None
+    finally:
+        ser.close()
+    return None
+
+
+def discover_ports(ports=None, baud=PROBE_BAUD, timeout=PROBE_TIMEOUT):
+    """
+    Probes all ports concurrently, returns {role: port}.
+    If two devices claim the same role the first port (sorted) wins.
+    """
+    if ports is None:
+        ports = candidate_ports()
+    if not ports:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(ports)) as pool:
+        roles = list(pool.map(lambda port: probe(port, baud, timeout), ports))
+    found = {}
+    for port, role in zip(ports, roles):
+        if role and role not in found:
+            found[role] = port
+    return found
+
+
+def dump_port(port):
+    #The old manual probe - open one port and show what comes in
+    try:
+        print(f"Opening {port}...")
+        ser = serial.Serial(port, PROBE_BAUD, timeout=1)
+        time.sleep(2)
+        print("Connected OK!")
+        print("Testing read...")
+        line = ser.readline()
+        print("Read:", line)
+        print("Looks like:", classify(line) or "unknown")
+    except Exception as e:
+        print("ERROR:", e)
+
+
+def main():
+    if len(sys.argv) > 1:
+        dump_port(sys.argv[1])
+        return
+    ports = candidate_ports()
+    print(f"Probing {len(ports)} port(s): {', '.join(ports) or 'none'}")
+    start = time.monotonic()
+    found = discover_ports(ports)
+    print(f"Done in {time.monotonic() - start:.1f}s")
+    for role, port in found.items():
+        print(f"  {role:>4}: {port}")
+
+
+if __name__ == "__main__":
+    main()